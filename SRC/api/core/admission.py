@@ -0,0 +1,159 @@
+"""
+Adaptive concurrency limits with early load shedding.
+
+Each name in ADMISSION_LIMITS gets an AdaptiveConcurrencyLimiter. Work runs
+inside `with admission(name):`; when all slots are busy a caller queues, and
+is rejected with Overloaded as soon as its expected queue wait exceeds
+ADMISSION_MAX_QUEUE_WAIT_S, rather than after waiting that long.
+
+The limit adapts to latency (AIMD): it grows by about one slot per limit's
+worth of fast completions while demand fills it, and shrinks by
+ADMISSION_BACKOFF when latency rises above ADMISSION_LATENCY_TOLERANCE times
+the best recent latency, i.e. when extra concurrency only adds contention.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import ADMISSION_REJECTIONS
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+class Overloaded(Exception):
+    """Shed because the queue for a limiter is too long; retry_after is a suggested wait in seconds."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is overloaded")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit for one kind of work, adjusted from observed latency."""
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int = 1, max_limit: int = 256,
+                 max_queue_wait: float = 0.5):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue_wait = max_queue_wait
+        self.in_flight = 0
+        self.waiting = 0
+        self.shed = 0
+        self._latency = None  # moving average, seconds
+        self._best_latency = None  # slowly decaying minimum
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _expected_wait(self) -> float:
+        if self._latency is None:
+            return 0.0
+        return (self.waiting + 1) * self._latency / max(1, int(self.limit))
+
+    def _reject(self, reason: str, retry_after: float) -> None:
+        self.shed += 1
+        if settings.METRICS_ENABLED:
+            ADMISSION_REJECTIONS.labels(self.name, reason).inc()
+        raise Overloaded(self.name, retry_after)
+
+    def acquire(self) -> None:
+        """Take a slot, queueing briefly, or raise Overloaded."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+            expected = self._expected_wait()
+            if expected > self.max_queue_wait:
+                self._reject("shed", expected)
+
+            deadline = time.monotonic() + self.max_queue_wait
+            self.waiting += 1
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._reject("queue_timeout", self._expected_wait() or self.max_queue_wait)
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self, latency: float) -> None:
+        """Free a slot and adapt the limit to the latency of the finished call."""
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self._observe(latency, saturated)
+            self._cond.notify()
+
+    def _observe(self, latency: float, saturated: bool) -> None:
+        if self._latency is None:
+            self._latency = self._best_latency = latency
+            return
+        self._latency += 0.1 * (latency - self._latency)
+        # Let the baseline drift up slowly so one lucky call does not pin it.
+        self._best_latency = min(latency, self._best_latency * 1.01)
+
+        now = time.monotonic()
+        if self._latency > self._best_latency * settings.ADMISSION_LATENCY_TOLERANCE:
+            # At most one decrease per average call, so a burst of slow calls counts once.
+            if now - self._last_decrease > self._latency:
+                self.limit = max(self.min_limit, self.limit * settings.ADMISSION_BACKOFF)
+                self._last_decrease = now
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "shed": self.shed,
+                "latency_ms": None if self._latency is None else round(self._latency * 1000, 2),
+            }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    """The limiter for name, created on first use from ADMISSION_LIMITS."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = AdaptiveConcurrencyLimiter(
+                name,
+                settings.ADMISSION_LIMITS[name],
+                max_limit=settings.ADMISSION_MAX_LIMIT,
+                max_queue_wait=settings.ADMISSION_MAX_QUEUE_WAIT_S,
+            )
+        return limiter
+
+
+@contextmanager
+def admission(name: str) -> Iterator[None]:
+    """Run the enclosed block under the concurrency limiter for name, or raise Overloaded."""
+    if not settings.ADMISSION_ENABLED or name not in settings.ADMISSION_LIMITS:
+        yield
+        return
+    limiter = get_concurrency_limiter(name)
+    limiter.acquire()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        limiter.release(time.perf_counter() - start)
+
+
+def admission_stats() -> Dict[str, dict]:
+    """Current limit and queue state of every limiter in this process."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
@@ -0,0 +1,45 @@
+"""
+Bloom filter for cheap "definitely not seen" checks.
+"""
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+
+    might_contain() never returns False for an added key; it returns True for
+    an absent key with probability about error_rate while no more than
+    capacity keys have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        # Double hashing: position i is h1 + i * h2.
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def might_contain(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def is_full(self) -> bool:
+        """Whether the false positive rate has grown past the configured error rate."""
+        return self.count >= self.capacity
@@ -0,0 +1,272 @@
+"""
+Database engines, session factory and connection pool instrumentation.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from sqlalchemy import Delete, Insert, Update, create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import observe
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+# Set while a read-only repository method runs; consulted by RoutingSession.
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+class PoolMetrics:
+    """Thread-safe counters describing how a connection pool is being used."""
+
+    def __init__(self, name: str = "primary"):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_saturation = 0.0
+
+    def record_checkout(self, wait: float, saturation: float, overflow: bool) -> None:
+        """Record a successful checkout and the time spent waiting for it."""
+        with self._lock:
+            self.checkouts += 1
+            if overflow:
+                self.overflow_checkouts += 1
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            if saturation > self.peak_saturation:
+                self.peak_saturation = saturation
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the counters."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "checkout_wait_avg": self.wait_total / self.checkouts if self.checkouts else 0.0,
+                "checkout_wait_max": self.wait_max,
+                "peak_saturation": self.peak_saturation,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times checkouts and tracks saturation and overflow."""
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        self.capacity = pool_size + max(max_overflow, 0)
+        self.metrics = PoolMetrics()
+
+    def saturation(self) -> float:
+        """Fraction of the pool (including overflow) currently checked out."""
+        if not self.capacity:
+            return 0.0
+        return self.checkedout() / self.capacity
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(
+            time.perf_counter() - start, self.saturation(), self.overflow() > 0
+        )
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    observe("db", operation, time.perf_counter() - context._query_start)
+
+
+def create_db_engine(url: str, name: str = "primary", read_only: bool = False) -> Engine:
+    """Create an engine with the pool settings from Settings."""
+    connect_args = {}
+    if url.startswith("postgresql"):
+        options = []
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            options.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+        if read_only:
+            options.append("-c default_transaction_read_only=on")
+        if options:
+            connect_args["options"] = " ".join(options)
+    if make_url(url).get_driver_name() == "psycopg":
+        # psycopg 3 switches a statement to a server-side prepared statement
+        # once it has been executed prepare_threshold times on a connection.
+        connect_args["prepare_threshold"] = settings.DB_PREPARE_THRESHOLD
+
+    db_engine = create_engine(
+        url,
+        echo=settings.DB_ECHO,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    db_engine.pool.metrics.name = name
+    if settings.METRICS_ENABLED:
+        event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+    return db_engine
+
+
+# Engines are created on first use so importing this module (and the DB driver)
+# costs nothing for processes that never touch the database.
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Return the primary engine, creating it on first use."""
+    db_engine = _engines.get("primary")
+    if db_engine is None:
+        with _engines_lock:
+            if "primary" not in _engines:
+                _engines["primary"] = create_db_engine(settings.DATABASE_URL)
+            db_engine = _engines["primary"]
+    return db_engine
+
+
+def get_replica_engine() -> Optional[Engine]:
+    """Return the replica engine, or None when no replica is configured."""
+    if not settings.DATABASE_REPLICA_URL:
+        return None
+    db_engine = _engines.get("replica")
+    if db_engine is None:
+        with _engines_lock:
+            if "replica" not in _engines:
+                _engines["replica"] = create_db_engine(
+                    settings.DATABASE_REPLICA_URL, name="replica", read_only=True
+                )
+            db_engine = _engines["replica"]
+    return db_engine
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads issued inside use_replica() to the replica engine.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary. Rows
+    written in the current transaction are not visible on the replica until
+    they are committed and replicated.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _use_replica.get()
+            and not self._flushing
+            and not isinstance(clause, (Insert, Update, Delete))
+        ):
+            replica = get_replica_engine()
+            if replica is not None:
+                return replica
+        return get_engine()
+
+
+# Write paths return rows loaded via RETURNING; keeping them loaded across
+# commit avoids a refresh SELECT on first attribute access.
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False
+)
+
+
+def get_db() -> Iterator[Session]:
+    """Yield a database session and close it afterwards."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def use_replica() -> Iterator[None]:
+    """Route reads made inside the block to the replica, if one is configured."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def read_only(func: Callable) -> Callable:
+    """Decorator for repository methods that may be served by the replica."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def get_engines() -> Dict[str, Engine]:
+    """Return the configured engines keyed by role."""
+    engines = {"primary": get_engine()}
+    replica = get_replica_engine()
+    if replica is not None:
+        engines["replica"] = replica
+    return engines
+
+
+def check_database_health() -> Dict[str, bool]:
+    """Run a trivial query against each engine and report which ones respond."""
+    status = {}
+    for name, db_engine in get_engines().items():
+        try:
+            with db_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            status[name] = True
+        except SQLAlchemyError as e:
+            logger.error("Database health check failed for %s: %s", name, e)
+            status[name] = False
+    return status
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Return live pool state and accumulated metrics for each engine created so far."""
+    stats = {}
+    for name, db_engine in list(_engines.items()):
+        pool = db_engine.pool
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": pool.saturation(),
+            **pool.metrics.snapshot(),
+        }
+    return stats
@@ -0,0 +1,153 @@
+"""
+Append-only change event stream with per-consumer offsets.
+
+The outbox relay appends events in batches; consumers read everything after
+their committed offset, handle it and commit the last offset they processed,
+so delivery is at-least-once and each consumer can be rewound to replay.
+Events carry their outbox event_id, which consumers can use to skip repeats.
+
+Backends (EVENT_STREAM_BACKEND):
+- "redis": a Redis stream (XADD/XRANGE), offsets in a hash next to it.
+- "local": in process memory, for tests and single-process development.
+"""
+import threading
+from typing import Callable, List, Optional, Tuple
+
+import orjson
+
+from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+Entry = Tuple[str, dict]  # offset, event
+
+
+class EventStream:
+    """Interface shared by the backends."""
+
+    start = "0"  # offset before the first event
+
+    def append_batch(self, events: List[dict]) -> List[str]:
+        """Append events in order and return their offsets."""
+        raise NotImplementedError
+
+    def read(self, after: str, count: int = 100) -> List[Entry]:
+        """Up to count events following offset after."""
+        raise NotImplementedError
+
+    def get_offset(self, consumer: str) -> str:
+        raise NotImplementedError
+
+    def commit_offset(self, consumer: str, offset: str) -> None:
+        raise NotImplementedError
+
+
+class RedisEventStream(EventStream):
+    """Redis stream backend; XRANGE with an exclusive start needs Redis 6.2+."""
+
+    start = "0-0"
+
+    def __init__(self, url: str, name: str, maxlen: Optional[int] = None):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self.name = name
+        self.maxlen = maxlen
+        self._offsets_key = f"{name}:offsets"
+
+    def append_batch(self, events: List[dict]) -> List[str]:
+        pipe = self._redis.pipeline(transaction=True)
+        for event in events:
+            pipe.xadd(self.name, {"event": orjson.dumps(event)}, maxlen=self.maxlen, approximate=True)
+        return [offset.decode() for offset in pipe.execute()]
+
+    def read(self, after: str, count: int = 100) -> List[Entry]:
+        entries = self._redis.xrange(self.name, min=f"({after}", max="+", count=count)
+        return [(offset.decode(), orjson.loads(fields[b"event"])) for offset, fields in entries]
+
+    def get_offset(self, consumer: str) -> str:
+        offset = self._redis.hget(self._offsets_key, consumer)
+        return offset.decode() if offset else self.start
+
+    def commit_offset(self, consumer: str, offset: str) -> None:
+        self._redis.hset(self._offsets_key, consumer, offset)
+
+
+class LocalEventStream(EventStream):
+    """In-memory backend; offsets are 1-based positions."""
+
+    def __init__(self):
+        self._events: List[dict] = []
+        self._offsets = {}
+        self._lock = threading.Lock()
+
+    def append_batch(self, events: List[dict]) -> List[str]:
+        with self._lock:
+            first = len(self._events) + 1
+            self._events.extend(events)
+            return [str(first + i) for i in range(len(events))]
+
+    def read(self, after: str, count: int = 100) -> List[Entry]:
+        position = int(after)
+        with self._lock:
+            chunk = self._events[position:position + count]
+        return [(str(position + i + 1), event) for i, event in enumerate(chunk)]
+
+    def get_offset(self, consumer: str) -> str:
+        return self._offsets.get(consumer, self.start)
+
+    def commit_offset(self, consumer: str, offset: str) -> None:
+        self._offsets[consumer] = offset
+
+
+class StreamConsumer:
+    """A named reader that resumes from its committed offset."""
+
+    def __init__(self, name: str, stream: Optional[EventStream] = None):
+        self.name = name
+        self.stream = stream or get_event_stream()
+
+    def poll(self, handler: Callable[[dict], None], count: int = 100) -> int:
+        """
+        Hand the next events to handler in order and commit past them.
+
+        If handler raises, the offset of the last handled event is committed
+        and the exception propagates; the failed event is delivered again on
+        the next poll.
+        """
+        entries = self.stream.read(self.stream.get_offset(self.name), count)
+        handled = None
+        try:
+            for offset, event in entries:
+                handler(event)
+                handled = offset
+        finally:
+            if handled is not None:
+                self.stream.commit_offset(self.name, handled)
+        return len(entries)
+
+    def replay(self, from_offset: Optional[str] = None) -> None:
+        """Rewind so the next poll starts after from_offset (default: the beginning)."""
+        self.stream.commit_offset(self.name, from_offset or self.stream.start)
+        logger.info("Consumer %s rewound to %s", self.name, from_offset or self.stream.start)
+
+
+_stream: Optional[EventStream] = None
+_stream_lock = threading.Lock()
+
+
+def get_event_stream() -> EventStream:
+    """The configured stream, created on first use."""
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            if settings.EVENT_STREAM_BACKEND == "local":
+                _stream = LocalEventStream()
+            else:
+                _stream = RedisEventStream(
+                    settings.EVENT_STREAM_URL or settings.CELERY_BROKER_URL,
+                    settings.EVENT_STREAM_NAME,
+                    settings.EVENT_STREAM_MAXLEN,
+                )
+        return _stream
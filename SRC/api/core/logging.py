@@ -1,42 +1,198 @@
 """
 Logging configuration for the application.
+
+Nothing is configured at import time; entry points (main.py, the Celery
+worker) call setup_logging() once.
+
+Records are handed to a bounded queue by the calling thread and formatted and
+written by a background QueueListener, so request threads never block on disk
+or console I/O. Message arguments are formatted on the listener thread; use
+%-style arguments (logger.info("x=%s", x)) rather than f-strings.
 """
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import random
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+
+from src.api.core.settings import settings
+
+# Attributes every LogRecord has; anything else was passed via extra= and is
+# emitted as a structured field.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop a share of records per logger before they are queued.
+
+    sample_rates maps a logger name prefix to the fraction of records kept;
+    rate_limits maps a prefix to the maximum records per second. The longest
+    matching prefix wins. WARNING and above are never dropped.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _match(name: str, rules: Dict[str, float]) -> Optional[str]:
+        best = None
+        for prefix in rules:
+            if (name == prefix or name.startswith(prefix + ".")) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return best
+
+    def _take_token(self, prefix: str) -> bool:
+        rate = self.rate_limits[prefix]
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(prefix, (rate, now))
+            tokens = min(rate, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            self._buckets[prefix] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix = self._match(record.name, self.sample_rates)
+        if prefix is not None and random.random() >= self.sample_rates[prefix]:
+            return False
+        prefix = self._match(record.name, self.rate_limits)
+        if prefix is not None and not self._take_token(prefix):
+            return False
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting and drops records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep msg/args as-is so formatting happens on the listener thread. The
+        # traceback is rendered now because exc_info must not outlive the caller.
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-# Create logs directory if it doesn't exist
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
 
 # Configure root logger
 logger = logging.getLogger("nodalcms")
-logger.setLevel(logging.DEBUG)
-
-# Create formatters
-formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-
-# File handler
-file_handler = logging.handlers.RotatingFileHandler(
-    LOG_DIR / "app.log",
-    maxBytes=10485760,  # 10MB
-    backupCount=5
-)
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _build_handlers() -> list:
+    """Create the handlers that run on the listener thread."""
+    log_dir = Path(settings.LOG_DIR)
+    log_dir.mkdir(exist_ok=True)
+
+    text_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+    # File handler
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "app.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(settings.LOG_LEVEL)
+    file_handler.setFormatter(JsonFormatter() if settings.LOG_JSON else text_formatter)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(settings.LOG_CONSOLE_LEVEL)
+    console_handler.setFormatter(text_formatter)
+
+    return [file_handler, console_handler]
+
+
+def _start_listener() -> None:
+    global _listener
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_after_fork() -> None:
+    # The listener thread does not survive fork(); give each child its own.
+    if _queue_handler is not None:
+        _start_listener()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging() -> None:
+    """Attach the queue handler to the application logger and start the listener."""
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    logger.setLevel(settings.LOG_LEVEL)
+    _queue_handler = NonBlockingQueueHandler(queue.Queue())
+    _queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS))
+    logger.addHandler(_queue_handler)
+    _start_listener()
+
+    atexit.register(stop_logging)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def get_dropped_count() -> int:
+    """Number of records discarded because the queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
 
 
 def get_logger(name: str) -> logging.Logger:
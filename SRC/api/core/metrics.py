@@ -0,0 +1,154 @@
+"""
+Prometheus metrics and timing helpers.
+
+timed() and timer() record durations into one histogram per category. When a
+request breakdown is active (see start_request_breakdown), the same durations
+are summed per category for that request so they can be returned to the
+caller, e.g. in a Server-Timing header.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from src.api.core.settings import settings
+
+REQUEST_SECONDS = Histogram(
+    "nodalcms_request_seconds", "HTTP request latency", ["method", "endpoint", "status"]
+)
+SERVICE_SECONDS = Histogram("nodalcms_service_seconds", "Service method latency", ["operation"])
+REPOSITORY_SECONDS = Histogram("nodalcms_repository_seconds", "Repository method latency", ["operation"])
+DB_SECONDS = Histogram("nodalcms_db_statement_seconds", "Database statement execution time", ["operation"])
+INFERENCE_SECONDS = Histogram("nodalcms_inference_seconds", "Model inference time", ["model"])
+HASHING_SECONDS = Histogram("nodalcms_password_hashing_seconds", "Password hashing time", ["operation"])
+SERIALIZATION_SECONDS = Histogram("nodalcms_serialization_seconds", "Response serialization time", ["endpoint"])
+MODEL_LOAD_SECONDS = Histogram("nodalcms_model_load_seconds", "Model load time", ["model"])
+PREDICTION_CACHE_LOOKUPS = Counter(
+    "nodalcms_prediction_cache_lookups", "Prediction cache lookups", ["model", "result"]
+)
+ACCIDENT_DUPLICATES = Counter(
+    "nodalcms_accident_duplicates", "Accident submissions answered with an existing row", ["source"]
+)
+ADMISSION_REJECTIONS = Counter(
+    "nodalcms_admission_rejections", "Calls rejected by rate or concurrency limits", ["limiter", "reason"]
+)
+SHADOW_COMPARISONS = Counter(
+    "nodalcms_shadow_comparisons", "Shadow model predictions compared with the primary", ["version", "outcome"]
+)
+
+_HISTOGRAMS: Dict[str, Histogram] = {
+    "service": SERVICE_SECONDS,
+    "repository": REPOSITORY_SECONDS,
+    "db": DB_SECONDS,
+    "inference": INFERENCE_SECONDS,
+    "hashing": HASHING_SECONDS,
+    "serialization": SERIALIZATION_SECONDS,
+    "model_load": MODEL_LOAD_SECONDS,
+}
+
+_breakdown: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_breakdown", default=None)
+
+
+def observe(category: str, label: str, seconds: float) -> None:
+    """Record a duration in the category histogram and the active breakdown."""
+    if not settings.METRICS_ENABLED:
+        return
+    _HISTOGRAMS[category].labels(label).observe(seconds)
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        breakdown[category] = breakdown.get(category, 0.0) + seconds
+
+
+@contextmanager
+def timer(category: str, label: str) -> Iterator[None]:
+    """Time the enclosed block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(category, label, time.perf_counter() - start)
+
+
+def timed(category: str, label: Optional[str] = None) -> Callable:
+    """Decorator that times each call; the label defaults to the function's qualified name."""
+
+    def decorator(func: Callable) -> Callable:
+        if not settings.METRICS_ENABLED:
+            return func
+        name = label or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(category, name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def start_request_breakdown() -> Dict[str, float]:
+    """Begin collecting per-category timings for the current request."""
+    breakdown: Dict[str, float] = {}
+    _breakdown.set(breakdown)
+    return breakdown
+
+
+def format_server_timing(breakdown: Dict[str, float]) -> str:
+    """Render a breakdown as a Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in breakdown.items())
+
+
+class PoolCollector:
+    """Expose connection pool state from core.database as gauges."""
+
+    def describe(self):
+        # Registering would otherwise call collect(), importing core.database
+        # while it may itself still be importing this module.
+        return []
+
+    def collect(self):
+        from src.api.core.database import get_pool_stats
+
+        families = {
+            key: GaugeMetricFamily(f"nodalcms_db_pool_{key}", f"Connection pool {key.replace('_', ' ')}", labels=["pool"])
+            for key in ("checked_out", "overflow", "saturation", "checkout_wait_max")
+        }
+        families.update({
+            key: CounterMetricFamily(f"nodalcms_db_pool_{key}", f"Connection pool {key.replace('_', ' ')}", labels=["pool"])
+            for key in ("checkouts", "overflow_checkouts", "timeouts")
+        })
+        for pool, stats in get_pool_stats().items():
+            for key, family in families.items():
+                family.add_metric([pool], stats[key])
+        yield from families.values()
+
+
+REGISTRY.register(PoolCollector())
+
+
+def render_metrics() -> tuple:
+    """Return the exposition body and content type for /metrics."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Several worker processes: merge the per-process files.
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,194 @@
+"""
+Delivery transports for notifications.
+
+A transport sends one batch of recipients at a time and keeps its connection
+open between batches; get_transport() caches one instance per channel in each
+worker process. Which transport serves a channel is set by
+NOTIFICATION_TRANSPORTS, so tests and local runs can map channels to "fake".
+"""
+import http.client
+import smtplib
+import threading
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import orjson
+
+from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+Recipient = Dict[str, Any]  # id, email, full_name
+
+
+class NotificationTransport:
+    """Base class; subclasses implement send_batch and, if they hold a connection, close."""
+
+    # Whether a batch costs one send per recipient (for rate limiting) or one in total.
+    per_recipient = True
+
+    def send_batch(self, recipients: List[Recipient], subject: str, message: str) -> int:
+        """Deliver the message to every recipient and return the number of sends made."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SmtpTransport(NotificationTransport):
+    """One email per recipient over a single reused SMTP session."""
+
+    def __init__(self, host: str, port: int, sender: str, username: Optional[str] = None,
+                 password: Optional[str] = None, use_tls: bool = False):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    @classmethod
+    def from_settings(cls) -> "SmtpTransport":
+        return cls(settings.SMTP_HOST, settings.SMTP_PORT, settings.NOTIFICATION_SENDER,
+                   settings.SMTP_USERNAME, settings.SMTP_PASSWORD, settings.SMTP_USE_TLS)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    def _session(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except smtplib.SMTPException:
+                self.close()
+        self._smtp = self._connect()
+        return self._smtp
+
+    def send_batch(self, recipients: List[Recipient], subject: str, message: str) -> int:
+        smtp = self._session()
+        for recipient in recipients:
+            email = EmailMessage()
+            email["From"] = self.sender
+            email["To"] = recipient["email"]
+            email["Subject"] = subject
+            email.set_content(message)
+            smtp.send_message(email)
+        return len(recipients)
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+class WebhookTransport(NotificationTransport):
+    """One JSON POST per batch over a keep-alive HTTP connection."""
+
+    per_recipient = False
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parts = urlsplit(url)
+        self.host = parts.netloc
+        self.path = parts.path or "/"
+        self.https = parts.scheme == "https"
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    @classmethod
+    def from_settings(cls) -> "WebhookTransport":
+        if not settings.NOTIFICATION_WEBHOOK_URL:
+            raise ValueError("NOTIFICATION_WEBHOOK_URL is not set")
+        return cls(settings.NOTIFICATION_WEBHOOK_URL)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self._conn = conn_class(self.host, timeout=self.timeout)
+        return self._conn
+
+    def send_batch(self, recipients: List[Recipient], subject: str, message: str) -> int:
+        body = orjson.dumps({
+            "subject": subject,
+            "message": message,
+            "recipients": [{"id": r["id"], "email": r["email"]} for r in recipients],
+        })
+        headers = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("POST", self.path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server may have closed an idle keep-alive connection.
+                self.close()
+                if attempt:
+                    raise
+        if response.status >= 400:
+            raise RuntimeError(f"Webhook returned HTTP {response.status}")
+        return 1
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class FakeTransport(NotificationTransport):
+    """Records batches in memory instead of sending them."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+
+    def send_batch(self, recipients: List[Recipient], subject: str, message: str) -> int:
+        self.sent.append({"recipients": list(recipients), "subject": subject, "message": message})
+        return len(recipients)
+
+
+_FACTORIES: Dict[str, Callable[[], NotificationTransport]] = {
+    "smtp": SmtpTransport.from_settings,
+    "webhook": WebhookTransport.from_settings,
+    "fake": FakeTransport,
+}
+_transports: Dict[str, NotificationTransport] = {}
+_lock = threading.Lock()
+
+
+def register_transport(kind: str, factory: Callable[[], NotificationTransport]) -> None:
+    """Make a transport kind available to NOTIFICATION_TRANSPORTS."""
+    _FACTORIES[kind] = factory
+
+
+def get_transport(channel: str) -> NotificationTransport:
+    """The cached transport for a channel, created on first use."""
+    with _lock:
+        transport = _transports.get(channel)
+        if transport is None:
+            kind = settings.NOTIFICATION_TRANSPORTS.get(channel)
+            if kind not in _FACTORIES:
+                raise ValueError(f"No transport configured for channel {channel!r}")
+            transport = _transports[channel] = _FACTORIES[kind]()
+        return transport
+
+
+def close_transports() -> None:
+    with _lock:
+        for channel, transport in _transports.items():
+            try:
+                transport.close()
+            except Exception as e:
+                logger.warning("Error closing %s transport: %s", channel, e)
+        _transports.clear()
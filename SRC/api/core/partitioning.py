@@ -0,0 +1,231 @@
+"""
+Monthly range partitioning of the accidents table (Postgres only).
+
+The parent table is partitioned on created_at, one partition per calendar
+month, named accidents_YYYY_MM. maintain_partitions() creates partitions
+ACCIDENT_PARTITION_MONTHS_AHEAD months ahead and archives partitions older
+than ACCIDENT_HOT_MONTHS: each is written to a compressed Parquet file in
+ACCIDENT_ARCHIVE_DIR, checked against the partition's row count, then detached
+and dropped.
+
+Creating a new database:
+    python -m src.api.core.partitioning create
+creates the users table if it is missing (accidents reference it) and the
+partitioned accidents table; Base.metadata.create_all then adds the rest and
+leaves both alone.
+
+Converting an existing database:
+    python -m src.api.core.partitioning convert
+renames the current table to accidents_legacy and attaches it as the
+partition for everything before the current month, so no rows are copied.
+The legacy partition is not archived automatically.
+"""
+import argparse
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+PARENT = "accidents"
+
+# Mirrors src.api.models.accident.Accident; the primary key has to include the
+# partition column.
+_CREATE_PARENT = f"""
+CREATE SEQUENCE IF NOT EXISTS {PARENT}_id_seq;
+CREATE TABLE {PARENT} (
+    id INTEGER NOT NULL DEFAULT nextval('{PARENT}_id_seq'),
+    user_id INTEGER REFERENCES users (id),
+    location VARCHAR(255) NOT NULL,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    severity VARCHAR(50) NOT NULL,
+    description TEXT,
+    status VARCHAR(50),
+    risk_score DOUBLE PRECISION,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE INDEX ix_{PARENT}_id ON {PARENT} (id);
+CREATE INDEX ix_{PARENT}_created_at ON {PARENT} (created_at);
+CREATE INDEX ix_{PARENT}_user_id ON {PARENT} (user_id);
+CREATE INDEX ix_{PARENT}_severity ON {PARENT} (severity);
+"""
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """First day of the month offset months from day's month."""
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """Whether the accidents table exists and is partitioned."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"), {"table": PARENT}
+    ).first() is not None
+
+
+def create_partitioned_table(conn: Connection) -> None:
+    """Create the partitioned parent table; it must not exist yet."""
+    conn.exec_driver_sql(_CREATE_PARENT)
+    ensure_partitions(conn)
+
+
+def ensure_partitions(conn: Connection, today: Optional[date] = None,
+                      months_ahead: Optional[int] = None) -> List[str]:
+    """Create missing monthly partitions from this month up to months_ahead; return the new ones."""
+    today = today or datetime.utcnow().date()
+    months_ahead = settings.ACCIDENT_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    existing = {name for name, _ in list_partitions(conn)}
+    created = []
+    for offset in range(months_ahead + 1):
+        start = month_start(today, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        conn.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} "
+            f"FOR VALUES FROM ('{start}') TO ('{month_start(start, 1)}')"
+        )
+        created.append(name)
+    if created:
+        logger.info("Created accident partitions: %s", ", ".join(created))
+    return created
+
+
+def list_partitions(conn: Connection) -> List[Tuple[str, str]]:
+    """(name, bound expression) of every partition of accidents."""
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+    ), {"table": PARENT})
+    return [(name, bound) for name, bound in rows]
+
+
+def _cold_partitions(conn: Connection, today: date) -> List[str]:
+    """Monthly partitions that end before the hot window starts."""
+    cutoff = partition_name(month_start(today, -settings.ACCIDENT_HOT_MONTHS))
+    return [
+        name for name, _ in list_partitions(conn)
+        if name[len(PARENT) + 1:].replace("_", "").isdigit() and name < cutoff
+    ]
+
+
+def archive_partition(engine: Engine, name: str) -> Path:
+    """Write a partition to Parquet, verify the row count, then detach and drop it."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    archive_dir = Path(settings.ACCIDENT_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.parquet"
+    partial = path.with_suffix(".parquet.partial")
+
+    written = 0
+    writer = None
+    with engine.connect().execution_options(stream_results=True, yield_per=50000) as conn:
+        result = conn.exec_driver_sql(f"SELECT * FROM {name} ORDER BY created_at, id")
+        columns = list(result.keys())
+        for rows in result.partitions():
+            batch = pa.Table.from_pylist([dict(zip(columns, row)) for row in rows])
+            if writer is None:
+                writer = pq.ParquetWriter(partial, batch.schema, compression=settings.ACCIDENT_ARCHIVE_COMPRESSION)
+            writer.write_table(batch)
+            written += len(rows)
+    if writer is not None:
+        writer.close()
+
+    with engine.begin() as conn:
+        expected = conn.exec_driver_sql(f"SELECT count(*) FROM {name}").scalar()
+        if expected != written:
+            raise RuntimeError(f"Archived {written} rows of {name} but it holds {expected}")
+        if written:
+            os.replace(partial, path)
+        conn.exec_driver_sql(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+        conn.exec_driver_sql(f"DROP TABLE {name}")
+        # Dedup keys of archived accidents can no longer resolve to a row.
+        bounds = name[len(PARENT) + 1:].split("_")
+        start = date(int(bounds[0]), int(bounds[1]), 1)
+        conn.execute(
+            text("DELETE FROM accident_dedup_keys WHERE created_at >= :start AND created_at < :end"),
+            {"start": start, "end": month_start(start, 1)},
+        )
+
+    logger.info("Archived partition %s (%s rows) to %s", name, written, path)
+    return path
+
+
+def maintain_partitions(engine: Engine, today: Optional[date] = None) -> dict:
+    """Create upcoming partitions and archive cold ones; a no-op unless accidents is partitioned."""
+    today = today or datetime.utcnow().date()
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            logger.info("accidents is not partitioned; skipping partition maintenance")
+            return {"created": [], "archived": []}
+        created = ensure_partitions(conn, today)
+        cold = _cold_partitions(conn, today)
+
+    archived = [str(archive_partition(engine, name)) for name in cold]
+    return {"created": created, "archived": archived}
+
+
+def convert_existing_table(engine: Engine) -> None:
+    """Turn an unpartitioned accidents table into the legacy partition of a partitioned one."""
+    boundary = month_start(datetime.utcnow().date())
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            logger.info("accidents is already partitioned")
+            return
+        conn.exec_driver_sql(f"ALTER TABLE {PARENT} RENAME TO {PARENT}_legacy")
+        conn.exec_driver_sql(f"ALTER SEQUENCE IF EXISTS {PARENT}_id_seq OWNED BY NONE")
+        # Index names are schema-wide; free them for the new parent.
+        for index in ("id", "created_at", "user_id", "severity"):
+            conn.exec_driver_sql(f"ALTER INDEX IF EXISTS ix_{PARENT}_{index} RENAME TO ix_{PARENT}_legacy_{index}")
+        conn.exec_driver_sql(_CREATE_PARENT)
+        conn.exec_driver_sql(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {PARENT}_legacy "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary}')"
+        )
+        ensure_partitions(conn)
+    logger.info("Converted accidents to a partitioned table; older rows live in %s_legacy", PARENT)
+
+
+def main() -> None:
+    from src.api.core.database import get_engine
+    from src.api.core.logging import setup_logging
+
+    parser = argparse.ArgumentParser(description="Manage accidents table partitions")
+    parser.add_argument("command", choices=["create", "convert", "maintain"])
+    args = parser.parse_args()
+
+    setup_logging()
+    engine = get_engine()
+    if args.command == "create":
+        from src.api.models.user import User
+
+        with engine.begin() as conn:
+            User.__table__.create(conn, checkfirst=True)
+            create_partitioned_table(conn)
+    elif args.command == "convert":
+        convert_existing_table(engine)
+    else:
+        print(maintain_partitions(engine))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Opt-in sampling profiler hooks.
+
+Nothing here is installed unless PROFILING_ENABLED is set: the HTTP middleware
+is not added, the Celery signals are not connected and profiled() returns the
+undecorated function. pyinstrument is only imported when a profile is taken.
+"""
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+# Set by the middleware for requests selected for profiling, so code running in
+# the threadpool on behalf of that request profiles itself as well.
+_request_sampled: ContextVar[bool] = ContextVar("profile_request", default=False)
+
+# pyinstrument allows one active profiler per thread.
+_active = threading.local()
+_task_profilers: Dict[str, object] = {}
+_pyinstrument_missing = False
+
+
+def should_sample(rate: float) -> bool:
+    """Randomly select a fraction of calls."""
+    return rate > 0 and random.random() < rate
+
+
+def start_profiler(async_mode: str = "disabled"):
+    """
+    Start a pyinstrument profiler on this thread, or return None if one is
+    already running or pyinstrument is not installed.
+    """
+    global _pyinstrument_missing
+    if _pyinstrument_missing or getattr(_active, "profiler", None) is not None:
+        return None
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        _pyinstrument_missing = True
+        logger.warning("Profiling enabled but pyinstrument is not installed")
+        return None
+
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode=async_mode)
+    profiler.start()
+    _active.profiler = profiler
+    return profiler
+
+
+def stop_profiler(profiler, name: str) -> Optional[Path]:
+    """Stop a profiler and write its report to PROFILING_OUTPUT_DIR."""
+    profiler.stop()
+    _active.profiler = None
+
+    output_dir = Path(settings.PROFILING_OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+
+    if settings.PROFILING_FORMAT == "speedscope":
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        path = output_dir / f"{stamp}-{safe_name}.speedscope.json"
+        path.write_text(profiler.output(renderer=SpeedscopeRenderer()))
+    else:
+        path = output_dir / f"{stamp}-{safe_name}.html"
+        path.write_text(profiler.output_html())
+
+    logger.info("Profile written to %s", path)
+    return path
+
+
+@contextmanager
+def profile(name: str, async_mode: str = "disabled") -> Iterator[None]:
+    """Profile the enclosed block and write a report named after name."""
+    profiler = start_profiler(async_mode)
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            stop_profiler(profiler, name)
+
+
+def mark_request_sampled() -> None:
+    """Flag the current request so profiled() functions it calls are profiled."""
+    _request_sampled.set(True)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator that profiles calls made while handling a sampled request."""
+
+    def decorator(func: Callable) -> Callable:
+        if not settings.PROFILING_ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _request_sampled.get():
+                return func(*args, **kwargs)
+            with profile(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _on_task_prerun(task_id=None, task=None, **kwargs) -> None:
+    short_name = task.name.rsplit(".", 1)[-1]
+    if short_name in settings.PROFILING_TASKS and should_sample(settings.PROFILING_TASK_SAMPLE_RATE):
+        profiler = start_profiler()
+        if profiler is not None:
+            _task_profilers[task_id] = profiler
+
+
+def _on_task_postrun(task_id=None, task=None, **kwargs) -> None:
+    profiler = _task_profilers.pop(task_id, None)
+    if profiler is not None:
+        stop_profiler(profiler, f"task-{task.name}-{task_id}")
+
+
+def connect_celery_signals() -> None:
+    """Profile a sample of the configured Celery tasks."""
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_on_task_prerun, weak=False)
+    task_postrun.connect(_on_task_postrun, weak=False)
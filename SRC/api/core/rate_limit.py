@@ -0,0 +1,146 @@
+"""
+Token-bucket rate limits per user and per client IP.
+
+Each named limit in RATE_LIMITS is (tokens per second, burst). A call to
+check_rate_limit(name, user) takes one token from the user's bucket and, when
+the request came in over HTTP, one from the client IP's bucket, and raises
+RateLimitExceeded if either is empty. With user_per_address the user's bucket
+is per (user, client IP), for limits such as login where the user is only a
+claim and a shared bucket would let anyone lock the real user out.
+
+Backends (RATE_LIMIT_BACKEND):
+- "local": buckets in process memory, so each worker process limits alone.
+- "redis": buckets shared by every process, updated atomically by a script.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import ADMISSION_REJECTIONS
+from src.api.core.settings import settings
+
+logger = get_logger(__name__)
+
+# Set by ClientAddressMiddleware for the current request.
+client_address: ContextVar[Optional[str]] = ContextVar("client_address", default=None)
+
+
+class RateLimitExceeded(Exception):
+    """Too many requests for a key; retry_after is the wait in seconds until a token is available."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Rate limit {name} exceeded")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class LocalRateLimiter:
+    """In-process token buckets; the least recently used keys are evicted past max_keys."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: int, cost: float = 1.0) -> float:
+        """Take cost tokens if available and return 0, otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+# Redis TIME keeps every process on the same clock. The result is returned as a
+# string because Redis truncates Lua numbers to integers.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local last = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - last) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets in Redis, shared by all API processes."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def acquire(self, key: str, rate: float, burst: int, cost: float = 1.0) -> float:
+        try:
+            return float(self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, cost]))
+        except Exception as exc:
+            # Fail open: an unreachable Redis should not turn every request away.
+            logger.warning("Rate limit check failed, allowing request: %s", exc)
+            return 0.0
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """The configured backend, created on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                _limiter = RedisRateLimiter(settings.RATE_LIMIT_URL or settings.CELERY_BROKER_URL)
+            else:
+                _limiter = LocalRateLimiter(settings.RATE_LIMIT_LOCAL_KEYS)
+        return _limiter
+
+
+def check_rate_limit(name: str, user: Optional[object] = None, cost: float = 1.0,
+                     user_per_address: bool = False) -> None:
+    """Take a token from the user's and the client IP's bucket for limit name, or raise RateLimitExceeded."""
+    if not settings.RATE_LIMIT_ENABLED or name not in settings.RATE_LIMITS:
+        return
+    rate, burst = settings.RATE_LIMITS[name]
+    address = client_address.get()
+    keys = []
+    if address is not None:
+        keys.append(f"{name}:ip:{address}")
+    if user is not None:
+        if user_per_address and address is not None:
+            keys.append(f"{name}:user:{user}@{address}")
+        else:
+            keys.append(f"{name}:user:{user}")
+
+    limiter = get_rate_limiter()
+    for key in keys:
+        wait = limiter.acquire(key, rate, burst, cost)
+        if wait > 0:
+            if settings.METRICS_ENABLED:
+                ADMISSION_REJECTIONS.labels(name, "rate_limited").inc()
+            logger.info("Rate limited %s (retry in %.2fs)", key, wait)
+            raise RateLimitExceeded(name, wait)
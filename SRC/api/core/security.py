@@ -8,6 +8,8 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from src.api.core.metrics import timed
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -22,11 +24,13 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 
+@timed("hashing", "verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@timed("hashing", "hash")
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
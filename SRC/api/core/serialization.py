@@ -0,0 +1,17 @@
+"""
+JSON serialization helpers for API responses.
+"""
+from typing import Any, Sequence
+
+import orjson
+from sqlalchemy.engine import Row
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes with orjson."""
+    return orjson.dumps(data)
+
+
+def rows_to_json(rows: Sequence[Row]) -> bytes:
+    """Serialize database rows straight to a JSON array, skipping validation."""
+    return orjson.dumps([row._asdict() for row in rows])
@@ -1,7 +1,7 @@
 """
 Application settings and configuration.
 """
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from pydantic_settings import BaseSettings
 
@@ -21,18 +21,130 @@ class Settings(BaseSettings):
     DB_ECHO: bool = False
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables the timeout
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_QUERY_CACHE_SIZE: int = 1000  # compiled statements kept per engine
+    DB_PREPARE_THRESHOLD: Optional[int] = 5  # psycopg 3 only; None disables
 
     # Security
     SECRET_KEY: str = "change-me-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
 
+    # Rate limits per user and client IP: name -> (tokens per second, burst)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "local"  # local (per process) or redis (shared)
+    RATE_LIMIT_URL: Optional[str] = None  # Redis; defaults to CELERY_BROKER_URL
+    RATE_LIMIT_LOCAL_KEYS: int = 100_000  # buckets kept per process
+    RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+        "login": (0.2, 5),
+        "create_accident": (2.0, 20),
+        "generate_report": (0.05, 3),
+    }
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # take the client IP from X-Forwarded-For
+
+    # Admission control: name -> initial concurrency limit per process
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: Dict[str, int] = {"login": 4, "create_accident": 16, "enqueue": 32}
+    ADMISSION_MAX_LIMIT: int = 256
+    ADMISSION_MAX_QUEUE_WAIT_S: float = 0.5  # callers expected to wait longer are shed
+    ADMISSION_LATENCY_TOLERANCE: float = 2.0  # latency over this multiple of the best shrinks the limit
+    ADMISSION_BACKOFF: float = 0.9
+
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_RESULT_EXPIRES: int = 3600  # seconds results are kept in the backend
+    CELERY_COMPRESSION: Optional[str] = "gzip"  # task and result payloads; None disables
+
+    # Accident ingestion
+    ACCIDENT_DEDUP_ENABLED: bool = False  # also dedup by payload; idempotency keys always dedup
+    ACCIDENT_DEDUP_WINDOW_S: int = 300  # identical payloads within this window or the previous one are one accident
+    ACCIDENT_IDEMPOTENCY_WINDOW_S: int = 86400  # how long idempotency keys are remembered
+    ACCIDENT_DEDUP_BLOOM_CAPACITY: int = 1_000_000  # keys per process before the filter is rebuilt
+    ACCIDENT_DEDUP_BLOOM_ERROR_RATE: float = 0.001
+    ACCIDENT_PARTITION_MONTHS_AHEAD: int = 3  # monthly partitions created in advance
+    ACCIDENT_HOT_MONTHS: int = 12  # older partitions are archived to Parquet and dropped
+    ACCIDENT_ARCHIVE_DIR: str = "archive/accidents"
+    ACCIDENT_ARCHIVE_COMPRESSION: str = "zstd"
+
+    # Change events (transactional outbox relayed to a stream)
+    CHANGE_EVENTS_ENABLED: bool = True
+    EVENT_STREAM_BACKEND: str = "redis"  # redis or local
+    EVENT_STREAM_URL: Optional[str] = None  # defaults to CELERY_BROKER_URL
+    EVENT_STREAM_NAME: str = "nodalcms:accident-events"
+    EVENT_STREAM_MAXLEN: int = 1_000_000  # approximate; older entries are trimmed
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_INTERVAL_S: float = 2.0
+    OUTBOX_RETENTION_S: int = 7 * 86400  # published events kept for inspection
+
+    # Notifications
+    NOTIFICATION_CHANNELS: list = ["email"]  # default channels for fan-out
+    NOTIFICATION_TRANSPORTS: Dict[str, str] = {"email": "smtp", "webhook": "webhook"}  # "fake" in tests
+    NOTIFICATION_BATCH_SIZE: int = 500  # recipients per delivery task
+    NOTIFICATION_RATE_LIMITS: Dict[str, float] = {"email": 50.0, "webhook": 10.0}  # sends/s per worker
+    NOTIFICATION_DEDUP_WINDOW_S: int = 3600
+    NOTIFICATION_DEDUP_URL: Optional[str] = None  # Redis; defaults to CELERY_BROKER_URL
+    NOTIFICATION_SENDER: str = "alerts@nodalcms.local"
+    NOTIFICATION_WEBHOOK_URL: Optional[str] = None
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = False
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_CONSOLE_LEVEL: str = "INFO"
+    LOG_DIR: str = "logs"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, not blocked on
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # logger prefix -> fraction kept
+    LOG_RATE_LIMITS: Dict[str, float] = {}  # logger prefix -> records per second
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    METRICS_REQUEST_BREAKDOWN: bool = False  # Server-Timing header; also on when DEBUG
+
+    # Profiling (pyinstrument); off unless PROFILING_ENABLED
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: Optional[str] = None  # header value that forces a profile
+    PROFILING_REQUEST_SAMPLE_RATE: float = 0.0
+    PROFILING_TASK_SAMPLE_RATE: float = 0.0
+    PROFILING_TASKS: list = ["process_accident_report", "train_model_task"]
+    PROFILING_INTERVAL: float = 0.001  # seconds between samples
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_FORMAT: str = "html"  # html or speedscope
 
     # ML Models
     MODEL_PATH: str = "models/"
+    MODEL_PRELOAD: bool = False  # load and warm models before workers fork
+    PREDICTION_CACHE_SIZE: int = 10000  # cached predictions per process; 0 disables
+    RESCORE_CHUNK_SIZE: int = 100_000  # accident ids per parallel re-scoring task
+    RESCORE_BATCH_SIZE: int = 2000  # rows read, predicted and written together
+    RESCORE_MAX_ROWS_PER_S: float = 5000.0  # per chunk task; 0 disables the cap
+    RESCORE_PAUSE_RATIO: float = 0.5  # idle time between batches relative to batch time
+
+    # Inference server (python -m src.api.ml.inference_server)
+    INFERENCE_SERVER_ENABLED: bool = False
+    INFERENCE_SOCKET_PATH: str = "/tmp/nodalcms-inference.sock"
+    INFERENCE_WORKERS: int = 0  # 0 means one per CPU
+    INFERENCE_TIMEOUT_MS: int = 200  # after this the API predicts in-process
+    INFERENCE_BATCH_WINDOW_MS: float = 2.0
+    INFERENCE_MAX_BATCH: int = 256
+    INFERENCE_CLIENT_CONNECTIONS: int = 4  # per API process
+    INFERENCE_RETRY_AFTER_S: float = 5.0
+
+    # Shadow evaluation of a candidate risk model (models/risk_model_<version>.pkl)
+    SHADOW_MODEL_VERSION: Optional[str] = None
+    SHADOW_SAMPLE_RATE: float = 1.0  # fraction of predictions mirrored
+    SHADOW_QUEUE_SIZE: int = 1000  # mirrored rows beyond this are dropped
+    SHADOW_BATCH_SIZE: int = 64
+    SHADOW_AGREEMENT_TOLERANCE: float = 0.05  # max score difference counted as agreement
     
     # CORS
     CORS_ORIGINS: list = [
@@ -1 +1,95 @@
-# NodalCMS API Main Entry Point
+"""
+NodalCMS API main entry point.
+"""
+import math
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+
+from src.api.core.admission import Overloaded, admission_stats
+from src.api.core.logging import setup_logging
+from src.api.core.metrics import render_metrics
+from src.api.core.rate_limit import RateLimitExceeded
+from src.api.core.settings import settings
+from src.api.middleware.client_address import ClientAddressMiddleware
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
+from src.api.ml.inference_client import start_inference_client, stop_inference_client
+from src.api.ml.model_loader import ModelLoader
+from src.api.ml.prediction_cache import prediction_cache
+from src.api.ml.shadow import shadow_stats
+
+setup_logging()
+
+if settings.MODEL_PRELOAD:
+    # With gunicorn --preload this runs once in the master, before forking.
+    ModelLoader.preload()
+
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, debug=settings.DEBUG)
+app.add_middleware(ClientAddressMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+app.add_event_handler("startup", start_inference_client)
+app.add_event_handler("shutdown", stop_inference_client)
+
+
+def _retry_after(seconds: float) -> dict:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Too many requests"}, status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers=_retry_after(exc.retry_after),
+    )
+
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Service overloaded, try again shortly"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers=_retry_after(exc.retry_after),
+    )
+
+
+@app.get("/health")
+def health() -> dict:
+    """Liveness probe."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready(response: Response) -> dict:
+    """Readiness probe; fails until models are warm when MODEL_PRELOAD is set, retrying a failed warmup."""
+    if settings.MODEL_PRELOAD and not ModelLoader.ensure_ready():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {"status": "ready"}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/models/shadow")
+def shadow() -> dict:
+    """Agreement and latency of the shadow model, as seen by this worker process."""
+    return {"shadow": shadow_stats()}
+
+
+@app.get("/models/cache")
+def prediction_cache_stats() -> dict:
+    """Prediction cache hit ratios per model for this worker process."""
+    return prediction_cache.stats()
+
+
+@app.get("/admission")
+def admission() -> dict:
+    """Concurrency limits and queue state for this worker process."""
+    return admission_stats()
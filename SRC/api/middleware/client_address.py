@@ -0,0 +1,33 @@
+"""
+ASGI middleware exposing the client IP to per-IP rate limits.
+"""
+from src.api.core.rate_limit import client_address
+from src.api.core.settings import settings
+
+
+class ClientAddressMiddleware:
+    """Set core.rate_limit.client_address for the duration of each request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _address(scope):
+        if settings.RATE_LIMIT_TRUST_FORWARDED:
+            for key, value in scope.get("headers", []):
+                if key == b"x-forwarded-for":
+                    # Only trusted behind a proxy that sets the header; the first entry is the client.
+                    return value.decode().split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = client_address.set(self._address(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            client_address.reset(token)
@@ -0,0 +1,43 @@
+"""
+ASGI middleware recording request latency and per-request timing breakdowns.
+"""
+import time
+
+from src.api.core.metrics import REQUEST_SECONDS, format_server_timing, start_request_breakdown
+from src.api.core.settings import settings
+
+
+class MetricsMiddleware:
+    """Record request latency per endpoint and optionally add a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+        self.breakdown_enabled = settings.METRICS_REQUEST_BREAKDOWN or settings.DEBUG
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        breakdown = start_request_breakdown() if self.breakdown_enabled else None
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if breakdown:
+                    breakdown["total"] = time.perf_counter() - start
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", format_server_timing(breakdown).encode()))
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by endpoint function rather than raw path to bound cardinality.
+            endpoint = scope.get("endpoint")
+            name = getattr(endpoint, "__name__", "unmatched")
+            REQUEST_SECONDS.labels(scope["method"], name, str(status)).observe(time.perf_counter() - start)
@@ -0,0 +1,44 @@
+"""
+ASGI middleware that profiles a sample of requests.
+"""
+import hmac
+
+from src.api.core.profiling import mark_request_sampled, should_sample, start_profiler, stop_profiler
+from src.api.core.settings import settings
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry the profiling header or fall in the sample.
+
+    The header value must match PROFILING_TOKEN so clients cannot trigger
+    profiles on their own. Only added to the app when PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode()
+
+    def _requested(self, scope) -> bool:
+        if not settings.PROFILING_TOKEN:
+            return False
+        for key, value in scope.get("headers", []):
+            if key == self.header:
+                # Compared as bytes: client headers may not be ASCII or even UTF-8.
+                return hmac.compare_digest(value, settings.PROFILING_TOKEN.encode())
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            self._requested(scope) or should_sample(settings.PROFILING_REQUEST_SAMPLE_RATE)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        mark_request_sampled()
+        profiler = start_profiler(async_mode="enabled")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if profiler is not None:
+                stop_profiler(profiler, f"{scope['method']}-{scope['path']}")
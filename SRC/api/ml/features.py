@@ -1,7 +1,7 @@
 """
 Feature extraction and engineering for ML models.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 from src.api.core.logging import get_logger
 
@@ -26,10 +26,32 @@ class FeatureExtractor:
         "residential": 2,
     }
 
+    # Encodings for every known (location, severity) pair, filled by
+    # precompute_risk_features() so the hot path is a dict lookup.
+    _RISK_FEATURE_TABLE: Dict[Tuple[str, str], List[float]] = {}
+
+    @classmethod
+    def precompute_risk_features(cls) -> None:
+        """Build the feature table for all known locations and severities."""
+        cls._RISK_FEATURE_TABLE = {
+            (location, severity): [float(severity_value), float(location_risk)]
+            for location, location_risk in cls.LOCATION_RISK_MAP.items()
+            for severity, severity_value in cls.SEVERITY_MAP.items()
+        }
+
+    @classmethod
+    def all_risk_features(cls) -> List[List[float]]:
+        """Every precomputed risk feature vector, e.g. as a warmup batch."""
+        return [list(features) for features in cls._RISK_FEATURE_TABLE.values()]
+
     @classmethod
     def extract_risk_features(cls, location: str, severity: str) -> List[float]:
         """Extract features for risk prediction."""
         try:
+            cached = cls._RISK_FEATURE_TABLE.get((location.lower(), severity.lower()))
+            if cached is not None:
+                return list(cached)
+
             features = []
             
             # Severity feature
@@ -43,12 +65,22 @@ class FeatureExtractor:
             # Time-based features (hour of day, day of week, etc.)
             # These should be added based on actual requirements
             
-            logger.debug(f"Extracted risk features: {features}")
+            logger.debug("Extracted risk features: %s", features)
             return features
         except Exception as e:
-            logger.error(f"Error extracting risk features: {str(e)}")
+            logger.error("Error extracting risk features: %s", e)
             return [2.0, 2.0]  # Default features
 
+    @classmethod
+    def extract_risk_features_batch(cls, rows: List[Tuple[str, str]]) -> List[List[float]]:
+        """Extract risk features for many (location, severity) pairs."""
+        table = cls._RISK_FEATURE_TABLE
+        features = []
+        for location, severity in rows:
+            cached = table.get((location.lower(), severity.lower()))
+            features.append(list(cached) if cached is not None else cls.extract_risk_features(location, severity))
+        return features
+
     @classmethod
     def extract_trend_features(cls, data: Dict[str, Any]) -> List[float]:
         """Extract features for trend prediction."""
@@ -63,13 +95,16 @@ class FeatureExtractor:
             if "growth_rate" in data:
                 features.append(float(data["growth_rate"]))
             
-            logger.debug(f"Extracted trend features: {features}")
+            logger.debug("Extracted trend features: %s", features)
             return features
         except Exception as e:
-            logger.error(f"Error extracting trend features: {str(e)}")
+            logger.error("Error extracting trend features: %s", e)
             return []
 
     @classmethod
     def normalize_features(cls, features: List[float], mean: float = 0, std: float = 1) -> List[float]:
         """Normalize features to zero mean and unit variance."""
         return [(f - mean) / (std + 1e-8) for f in features]
+
+
+FeatureExtractor.precompute_risk_features()
@@ -0,0 +1,194 @@
+"""
+Async client for the out-of-process inference server.
+
+Single-row predictions arriving within INFERENCE_BATCH_WINDOW_MS are coalesced
+into one batch per model and sent over a small pool of Unix socket
+connections. If the server is slow, down or returns an error, the batch is
+predicted in-process instead and the server is skipped for
+INFERENCE_RETRY_AFTER_S seconds.
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+from src.api.ml.inference_protocol import InferenceError, decode_values, encode_frame, encode_matrix, read_frame
+from src.api.ml.model_loader import ModelLoader
+
+logger = get_logger(__name__)
+
+_LOCAL_MODELS = {
+    "risk": ModelLoader.load_risk_model,
+    "trend": ModelLoader.load_trend_model,
+}
+
+
+def predict_local(model_name: str, rows: List[List[float]]) -> List[Optional[float]]:
+    """Predict a batch in this process; None for every row if the model is missing."""
+    model = _LOCAL_MODELS[model_name]()
+    if model is None:
+        return [None] * len(rows)
+    return [float(value) for value in model.predict(rows)]
+
+
+class _Connection:
+    """One socket connection; used by a single in-flight request at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, header: dict, body: bytes) -> Tuple[dict, bytes]:
+        self.writer.write(encode_frame(header, body))
+        await self.writer.drain()
+        return await read_frame(self.reader)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class InferenceClient:
+    """Coalescing, pooled client with timeouts and in-process fallback."""
+
+    def __init__(self, socket_path: str = settings.INFERENCE_SOCKET_PATH):
+        self.socket_path = socket_path
+        self.timeout = settings.INFERENCE_TIMEOUT_MS / 1000
+        self.batch_window = settings.INFERENCE_BATCH_WINDOW_MS / 1000
+        self.max_batch = settings.INFERENCE_MAX_BATCH
+        self.max_connections = settings.INFERENCE_CLIENT_CONNECTIONS
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[_Connection] = []
+        self._pending: Dict[str, list] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._ids = itertools.count()
+        self._skip_until = 0.0
+
+    async def start(self) -> None:
+        """Bind the client to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_connections)
+
+    async def close(self) -> None:
+        for connection in self._idle:
+            connection.close()
+        self._idle.clear()
+        self._loop = None
+
+    async def predict(self, model_name: str, features: List[float]) -> Optional[float]:
+        """Predict one row; the row is batched with concurrent calls for the same model."""
+        future = self._loop.create_future()
+        batch = self._pending.setdefault(model_name, [])
+        batch.append((features, future))
+        if len(batch) >= self.max_batch:
+            self._flush(model_name)
+        elif model_name not in self._flush_handles:
+            self._flush_handles[model_name] = self._loop.call_later(self.batch_window, self._flush, model_name)
+        return await future
+
+    def predict_sync(self, model_name: str, features: List[float]) -> Optional[float]:
+        """
+        Predict from synchronous code running in a worker thread.
+
+        Raises RuntimeError if the client is not started or if called from the
+        event loop thread itself, where blocking would deadlock.
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            raise RuntimeError("Inference client is not running")
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            raise RuntimeError("predict_sync called from the event loop thread")
+        future = asyncio.run_coroutine_threadsafe(self.predict(model_name, features), loop)
+        # The coroutine already falls back locally on timeout; allow for that too.
+        return future.result(timeout=self.timeout * 2 + 5)
+
+    def _flush(self, model_name: str) -> None:
+        handle = self._flush_handles.pop(model_name, None)
+        if handle is not None:
+            handle.cancel()
+        batch = self._pending.pop(model_name, None)
+        if batch:
+            self._loop.create_task(self._run_batch(model_name, batch))
+
+    async def _run_batch(self, model_name: str, batch: list) -> None:
+        rows = [features for features, _ in batch]
+        try:
+            try:
+                if time.monotonic() < self._skip_until:
+                    raise InferenceError("inference server marked unavailable")
+                predictions = await asyncio.wait_for(self._remote_predict(model_name, rows), self.timeout)
+            except (asyncio.TimeoutError, OSError, InferenceError) as e:
+                if time.monotonic() >= self._skip_until:
+                    logger.warning("Inference server failed (%s); predicting in-process", e)
+                    self._skip_until = time.monotonic() + settings.INFERENCE_RETRY_AFTER_S
+                predictions = await asyncio.to_thread(predict_local, model_name, rows)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+    async def _remote_predict(self, model_name: str, rows: List[List[float]]) -> List[float]:
+        header = {
+            "id": next(self._ids),
+            "model": model_name,
+            "method": "predict",
+            "rows": len(rows),
+            "cols": len(rows[0]),
+        }
+        await self._slots.acquire()
+        connection = None
+        try:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+                connection = _Connection(reader, writer)
+            response, body = await connection.request(header, encode_matrix(rows))
+        except BaseException:
+            # A cancelled or failed exchange leaves the stream in an unknown state.
+            if connection is not None:
+                connection.close()
+            self._slots.release()
+            raise
+
+        self._idle.append(connection)
+        self._slots.release()
+        if not response.get("ok"):
+            raise InferenceError(response.get("error", "unknown error"))
+        return decode_values(body)
+
+
+_client: Optional[InferenceClient] = None
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """The started client, or None when the inference server is disabled or not running."""
+    if _client is None or _client._loop is None:
+        return None
+    return _client
+
+
+async def start_inference_client() -> None:
+    """Create and start the shared client; called from the API startup hook."""
+    global _client
+    if settings.INFERENCE_SERVER_ENABLED:
+        _client = InferenceClient()
+        await _client.start()
+
+
+async def stop_inference_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
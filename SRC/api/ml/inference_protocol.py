@@ -0,0 +1,47 @@
+"""
+Wire format shared by the inference server and client.
+
+A frame is two big-endian uint32 lengths followed by a JSON header and a binary
+body. Feature matrices and predictions travel in the body as little-endian
+float64 values in row-major order; the header carries their shape.
+"""
+import asyncio
+import struct
+from array import array
+from typing import List, Tuple
+
+import orjson
+
+_LENGTHS = struct.Struct(">II")
+
+
+class InferenceError(Exception):
+    """Raised when the inference server reports a failure."""
+
+
+def encode_matrix(rows: List[List[float]]) -> bytes:
+    """Pack a list of equal-length rows as float64 bytes."""
+    values = array("d")
+    for row in rows:
+        values.extend(row)
+    return values.tobytes()
+
+
+def decode_values(body: bytes) -> List[float]:
+    """Unpack float64 bytes into a flat list."""
+    values = array("d")
+    values.frombytes(body)
+    return values.tolist()
+
+
+def encode_frame(header: dict, body: bytes = b"") -> bytes:
+    payload = orjson.dumps(header)
+    return _LENGTHS.pack(len(payload), len(body)) + payload + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[dict, bytes]:
+    """Read one frame; raises IncompleteReadError when the peer closes."""
+    header_len, body_len = _LENGTHS.unpack(await reader.readexactly(_LENGTHS.size))
+    header = orjson.loads(await reader.readexactly(header_len))
+    body = await reader.readexactly(body_len) if body_len else b""
+    return header, body
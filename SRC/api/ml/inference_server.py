@@ -0,0 +1,135 @@
+"""
+Out-of-process inference server.
+
+The master loads and warms the models, binds a Unix socket and forks a pool of
+worker processes that share the models copy-on-write and accept connections on
+the same socket. Each worker runs predictions on whole batches sent by
+InferenceClient, so inference scales with cores independently of the API
+processes and never competes with request handling for their GIL.
+
+Run with: python -m src.api.ml.inference_server [--workers N] [--socket PATH]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from typing import Tuple
+
+from src.api.core.logging import get_logger, setup_logging
+from src.api.core.settings import settings
+from src.api.ml.inference_protocol import encode_frame, read_frame
+from src.api.ml.model_loader import ModelLoader
+
+logger = get_logger(__name__)
+
+_MODELS = {
+    "risk": ModelLoader.load_risk_model,
+    "trend": ModelLoader.load_trend_model,
+}
+
+
+def execute(header: dict, body: bytes) -> Tuple[dict, bytes]:
+    """Run one batch request and build the response frame."""
+    import numpy as np
+
+    request_id = header.get("id")
+    try:
+        loader = _MODELS.get(header["model"])
+        model = loader() if loader else None
+        if model is None:
+            return {"id": request_id, "ok": False, "error": f"model {header['model']} not available"}, b""
+
+        rows = np.frombuffer(body, dtype="<f8").reshape(header["rows"], header["cols"])
+        if header.get("method") == "predict_proba":
+            output = np.asarray(model.predict_proba(rows), dtype="<f8")
+        else:
+            output = np.asarray(model.predict(rows), dtype="<f8")
+        cols = output.shape[1] if output.ndim == 2 else 1
+        return {"id": request_id, "ok": True, "rows": output.shape[0], "cols": cols}, output.tobytes()
+    except Exception as e:
+        logger.error("Inference request failed: %s", e)
+        return {"id": request_id, "ok": False, "error": str(e)}, b""
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            header, body = await read_frame(reader)
+            writer.write(encode_frame(*execute(header, body)))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve_worker(sock: socket.socket) -> None:
+    server = await asyncio.start_unix_server(_handle_connection, sock=sock)
+    async with server:
+        await server.serve_forever()
+
+
+def _spawn_worker(sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            asyncio.run(_serve_worker(sock))
+        finally:
+            os._exit(0)
+    return pid
+
+
+def serve(socket_path: str, workers: int) -> None:
+    """Preload models, bind the socket and supervise the worker pool."""
+    ModelLoader.preload()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.listen(1024)
+
+    children = {_spawn_worker(sock) for _ in range(workers)}
+    logger.info("Inference server listening on %s with %s workers", socket_path, workers)
+
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    try:
+        while children:
+            try:
+                pid, _status = os.wait()
+            except ChildProcessError:
+                break
+            children.discard(pid)
+            if not stopping:
+                logger.warning("Inference worker %s exited; restarting", pid)
+                children.add(_spawn_worker(sock))
+    finally:
+        sock.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NodalCMS inference server")
+    parser.add_argument("--socket", default=settings.INFERENCE_SOCKET_PATH)
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_WORKERS or os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    setup_logging()
+    serve(args.socket, args.workers)
+
+
+if __name__ == "__main__":
+    main()
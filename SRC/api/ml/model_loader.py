@@ -1,12 +1,18 @@
 """
 Model loader for loading trained ML models.
 """
+import gc
 import pickle
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Dict, Optional
 
 from src.api.core.logging import get_logger
+from src.api.core.metrics import timer
 from src.api.core.settings import settings
+from src.api.ml.features import FeatureExtractor
+from src.api.ml.prediction_cache import prediction_cache
 
 logger = get_logger(__name__)
 
@@ -17,6 +23,38 @@ class ModelLoader:
     _risk_model = None
     _trend_model = None
     _scaler = None
+    _candidates: Dict[str, Any] = {}
+    _versions: Dict[str, str] = {}
+    _warm = False
+    _warm_attempted_at: Optional[float] = None
+    _warm_lock = threading.Lock()
+
+    @staticmethod
+    def _file_version(path: Path) -> str:
+        """Identify a model file by modification time and size."""
+        stat = path.stat()
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    @classmethod
+    def model_version(cls, name: str) -> Optional[str]:
+        """Version of the loaded "risk" or "trend" model, None if it is not loaded."""
+        return cls._versions.get(name)
+
+    @classmethod
+    def file_version(cls, name: str) -> Optional[str]:
+        """Version of the "risk" or "trend" model file on disk, None if there is none."""
+        model_path = Path(settings.MODEL_PATH) / f"{name}_model.pkl"
+        try:
+            return cls._file_version(model_path)
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def reload_risk_model(cls) -> Optional[Any]:
+        """Load the risk model file again, replacing only the cached risk model."""
+        cls._risk_model = None
+        cls._versions.pop("risk", None)
+        return cls.load_risk_model()
 
     @classmethod
     def load_risk_model(cls) -> Optional[Any]:
@@ -27,16 +65,17 @@ class ModelLoader:
         try:
             model_path = Path(settings.MODEL_PATH) / "risk_model.pkl"
             if not model_path.exists():
-                logger.warning(f"Risk model not found at {model_path}")
+                logger.warning("Risk model not found at %s", model_path)
                 return None
             
-            with open(model_path, "rb") as f:
+            with timer("model_load", "risk"), open(model_path, "rb") as f:
                 cls._risk_model = pickle.load(f)
+            cls._versions["risk"] = cls._file_version(model_path)
             
             logger.info("Risk model loaded successfully")
             return cls._risk_model
         except Exception as e:
-            logger.error(f"Error loading risk model: {str(e)}")
+            logger.error("Error loading risk model: %s", e)
             return None
 
     @classmethod
@@ -48,16 +87,38 @@ class ModelLoader:
         try:
             model_path = Path(settings.MODEL_PATH) / "trend_model.pkl"
             if not model_path.exists():
-                logger.warning(f"Trend model not found at {model_path}")
+                logger.warning("Trend model not found at %s", model_path)
                 return None
             
-            with open(model_path, "rb") as f:
+            with timer("model_load", "trend"), open(model_path, "rb") as f:
                 cls._trend_model = pickle.load(f)
+            cls._versions["trend"] = cls._file_version(model_path)
             
             logger.info("Trend model loaded successfully")
             return cls._trend_model
         except Exception as e:
-            logger.error(f"Error loading trend model: {str(e)}")
+            logger.error("Error loading trend model: %s", e)
+            return None
+
+    @classmethod
+    def load_candidate_model(cls, version: str) -> Optional[Any]:
+        """Load or return a cached candidate risk model stored as risk_model_<version>.pkl."""
+        if version in cls._candidates:
+            return cls._candidates[version]
+
+        try:
+            model_path = Path(settings.MODEL_PATH) / f"risk_model_{version}.pkl"
+            if not model_path.exists():
+                logger.warning("Candidate model %s not found at %s", version, model_path)
+                return None
+
+            with timer("model_load", f"risk_{version}"), open(model_path, "rb") as f:
+                cls._candidates[version] = pickle.load(f)
+
+            logger.info("Candidate risk model %s loaded successfully", version)
+            return cls._candidates[version]
+        except Exception as e:
+            logger.error("Error loading candidate model %s: %s", version, e)
             return None
 
     @classmethod
@@ -69,22 +130,88 @@ class ModelLoader:
         try:
             scaler_path = Path(settings.MODEL_PATH) / "scaler.pkl"
             if not scaler_path.exists():
-                logger.warning(f"Scaler not found at {scaler_path}")
+                logger.warning("Scaler not found at %s", scaler_path)
                 return None
             
-            with open(scaler_path, "rb") as f:
+            with timer("model_load", "scaler"), open(scaler_path, "rb") as f:
                 cls._scaler = pickle.load(f)
             
             logger.info("Scaler loaded successfully")
             return cls._scaler
         except Exception as e:
-            logger.error(f"Error loading scaler: {str(e)}")
+            logger.error("Error loading scaler: %s", e)
             return None
 
+    @classmethod
+    def preload(cls) -> bool:
+        """
+        Load every model and run warmup predictions.
+
+        Meant to run in the master process before uvicorn/gunicorn or Celery
+        fork their workers: the loaded models are then shared copy-on-write,
+        and gc.freeze() keeps the collector from touching (and so copying)
+        those pages in the children.
+
+        Returns False, leaving the loader not ready, if the risk model is
+        missing or warmup fails.
+        """
+        cls._warm_attempted_at = time.monotonic()
+        risk_model = cls.load_risk_model()
+        trend_model = cls.load_trend_model()
+        cls.load_scaler()
+        if settings.SHADOW_MODEL_VERSION:
+            cls.load_candidate_model(settings.SHADOW_MODEL_VERSION)
+
+        if risk_model is None:
+            logger.error("Risk model could not be loaded; models are not ready")
+            return False
+        try:
+            warmup_batch = FeatureExtractor.all_risk_features()
+            risk_model.predict(warmup_batch)
+            if hasattr(risk_model, "predict_proba"):
+                risk_model.predict_proba(warmup_batch)
+            if trend_model is not None and hasattr(trend_model, "n_features_in_"):
+                trend_model.predict([[0.0] * trend_model.n_features_in_])
+        except Exception as e:
+            logger.error("Error warming up models: %s", e)
+            return False
+
+        gc.collect()
+        gc.freeze()
+        cls._warm = True
+        logger.info("Models preloaded and warmed up")
+        return True
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Whether preload() has completed in this process (or its parent)."""
+        return cls._warm
+
+    @classmethod
+    def ensure_ready(cls, retry_interval: float = 10.0) -> bool:
+        """
+        Whether models are warm, retrying preload() if the last attempt failed
+        at least retry_interval seconds ago, e.g. because the model files were
+        not there yet.
+        """
+        if cls._warm:
+            return True
+        with cls._warm_lock:
+            if cls._warm:
+                return True
+            last = cls._warm_attempted_at
+            if last is not None and time.monotonic() - last < retry_interval:
+                return False
+            return cls.preload()
+
     @classmethod
     def clear_cache(cls):
         """Clear cached models."""
         cls._risk_model = None
         cls._trend_model = None
         cls._scaler = None
+        cls._candidates = {}
+        cls._versions = {}
+        cls._warm = False
+        prediction_cache.clear()
         logger.info("Model cache cleared")
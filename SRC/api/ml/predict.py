@@ -4,8 +4,10 @@ Prediction module for making inferences with trained models.
 from typing import List, Any, Optional
 
 from src.api.core.logging import get_logger
+from src.api.core.metrics import timer
 from src.api.ml.model_loader import ModelLoader
 from src.api.ml.features import FeatureExtractor
+from src.api.ml.prediction_cache import MISSING, prediction_cache
 
 logger = get_logger(__name__)
 
@@ -16,6 +18,8 @@ class Predictor:
     def __init__(self):
         self.risk_model = ModelLoader.load_risk_model()
         self.trend_model = ModelLoader.load_trend_model()
+        self.risk_version = ModelLoader.model_version("risk")
+        self.trend_version = ModelLoader.model_version("trend")
 
     def predict_risk(self, features: List[float]) -> Optional[float]:
         """Predict risk score."""
@@ -24,10 +28,15 @@ class Predictor:
                 logger.warning("Risk model not available")
                 return None
             
-            prediction = self.risk_model.predict([features])[0]
-            return float(prediction)
+            cached = prediction_cache.get("risk", self.risk_version, features)
+            if cached is not MISSING:
+                return cached
+            with timer("inference", "risk"):
+                prediction = float(self.risk_model.predict([features])[0])
+            prediction_cache.put("risk", self.risk_version, features, prediction)
+            return prediction
         except Exception as e:
-            logger.error(f"Error during risk prediction: {str(e)}")
+            logger.error("Error during risk prediction: %s", e)
             return None
 
     def predict_risk_proba(self, features: List[float]) -> Optional[List[float]]:
@@ -37,10 +46,15 @@ class Predictor:
                 logger.warning("Risk model not available or doesn't support probability")
                 return None
             
-            probabilities = self.risk_model.predict_proba([features])[0]
+            cached = prediction_cache.get("risk_proba", self.risk_version, features)
+            if cached is not MISSING:
+                return list(cached)
+            with timer("inference", "risk_proba"):
+                probabilities = tuple(float(p) for p in self.risk_model.predict_proba([features])[0])
+            prediction_cache.put("risk_proba", self.risk_version, features, probabilities)
             return list(probabilities)
         except Exception as e:
-            logger.error(f"Error during risk probability prediction: {str(e)}")
+            logger.error("Error during risk probability prediction: %s", e)
             return None
 
     def predict_trend(self, features: List[float]) -> Optional[float]:
@@ -50,10 +64,15 @@ class Predictor:
                 logger.warning("Trend model not available")
                 return None
             
-            prediction = self.trend_model.predict([features])[0]
-            return float(prediction)
+            cached = prediction_cache.get("trend", self.trend_version, features)
+            if cached is not MISSING:
+                return cached
+            with timer("inference", "trend"):
+                prediction = float(self.trend_model.predict([features])[0])
+            prediction_cache.put("trend", self.trend_version, features, prediction)
+            return prediction
         except Exception as e:
-            logger.error(f"Error during trend prediction: {str(e)}")
+            logger.error("Error during trend prediction: %s", e)
             return None
 
     def batch_predict(self, features_list: List[List[float]]) -> Optional[List[float]]:
@@ -63,8 +82,15 @@ class Predictor:
                 logger.warning("Risk model not available")
                 return None
             
-            predictions = self.risk_model.predict(features_list)
-            return list(predictions)
+            predictions = [prediction_cache.get("risk", self.risk_version, row) for row in features_list]
+            missing = [i for i, value in enumerate(predictions) if value is MISSING]
+            if missing:
+                with timer("inference", "risk_batch"):
+                    computed = self.risk_model.predict([features_list[i] for i in missing])
+                for i, value in zip(missing, computed):
+                    predictions[i] = float(value)
+                    prediction_cache.put("risk", self.risk_version, features_list[i], predictions[i])
+            return predictions
         except Exception as e:
-            logger.error(f"Error during batch prediction: {str(e)}")
+            logger.error("Error during batch prediction: %s", e)
             return None
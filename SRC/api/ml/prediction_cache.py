@@ -0,0 +1,76 @@
+"""
+In-process LRU cache of model outputs.
+
+Risk features come from a handful of categorical inputs, so the same feature
+vectors are predicted over and over. Entries are keyed by model name, model
+version and the feature vector, so a reloaded model never serves results from
+its predecessor; ModelLoader.clear_cache() also empties the cache outright.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+from src.api.core.metrics import PREDICTION_CACHE_LOOKUPS
+from src.api.core.settings import settings
+
+MISSING = object()
+
+
+class PredictionCache:
+    """Thread-safe LRU mapping (model, version, features) to a prediction."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    @staticmethod
+    def _key(model: str, version: str, features: Sequence[float]) -> Tuple[Hashable, ...]:
+        return (model, version, tuple(features))
+
+    def get(self, model: str, version: Optional[str], features: Sequence[float]) -> Any:
+        """Cached value, or MISSING; a None version (model not loaded from disk) never hits."""
+        if version is None or self.max_size <= 0:
+            return MISSING
+        key = self._key(model, version, features)
+        with self._lock:
+            value = self._entries.get(key, MISSING)
+            if value is MISSING:
+                self._misses[model] = self._misses.get(model, 0) + 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits[model] = self._hits.get(model, 0) + 1
+        if settings.METRICS_ENABLED:
+            PREDICTION_CACHE_LOOKUPS.labels(model, "miss" if value is MISSING else "hit").inc()
+        return value
+
+    def put(self, model: str, version: Optional[str], features: Sequence[float], value: Any) -> None:
+        if version is None or self.max_size <= 0:
+            return
+        key = self._key(model, version, features)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, dict]:
+        """Lookups and hit ratio per model since the process started."""
+        with self._lock:
+            models = set(self._hits) | set(self._misses)
+            result = {}
+            for model in sorted(models):
+                hits = self._hits.get(model, 0)
+                lookups = hits + self._misses.get(model, 0)
+                result[model] = {"hits": hits, "lookups": lookups, "hit_ratio": hits / lookups}
+            result["_size"] = {"entries": len(self._entries), "max_size": self.max_size}
+            return result
+
+
+prediction_cache = PredictionCache(settings.PREDICTION_CACHE_SIZE)
@@ -0,0 +1,196 @@
+"""
+Shadow evaluation of a candidate risk model.
+
+PredictionService.predict_risk mirrors each feature vector, together with the
+primary model's score and latency (None when the score came from the
+prediction cache), into a bounded queue. A background thread
+drains the queue in batches, scores them with the candidate model and records
+how often the two models agree. The request path only pays for a put_nowait;
+when the queue is full the row is dropped rather than waited on.
+"""
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import SHADOW_COMPARISONS, observe
+from src.api.core.settings import settings
+from src.api.ml.model_loader import ModelLoader
+
+logger = get_logger(__name__)
+
+_Item = Tuple[List[float], float, Optional[float]]  # features, primary score, primary seconds or None
+
+
+class ShadowStats:
+    """Running agreement and latency totals for one candidate version."""
+
+    def __init__(self, version: str, tolerance: float):
+        self.version = version
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self.compared = 0
+        self.agreed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.abs_diff_total = 0.0
+        self.max_abs_diff = 0.0
+        self.primary_seconds = 0.0
+        self.primary_calls = 0
+        self.candidate_seconds = 0.0
+        self.candidate_batches = 0
+
+    def record_batch(self, primary: List[float], candidate: List[float],
+                     primary_timings: List[float], candidate_seconds: float) -> None:
+        """Record one candidate batch; primary_timings holds the rows that ran the primary model."""
+        agreed = 0
+        diff_total = 0.0
+        max_diff = 0.0
+        for p, c in zip(primary, candidate):
+            diff = abs(p - c)
+            diff_total += diff
+            max_diff = max(max_diff, diff)
+            if diff <= self.tolerance:
+                agreed += 1
+
+        with self._lock:
+            self.compared += len(primary)
+            self.agreed += agreed
+            self.abs_diff_total += diff_total
+            self.max_abs_diff = max(self.max_abs_diff, max_diff)
+            self.primary_seconds += sum(primary_timings)
+            self.primary_calls += len(primary_timings)
+            self.candidate_seconds += candidate_seconds
+            self.candidate_batches += 1
+
+        if settings.METRICS_ENABLED:
+            SHADOW_COMPARISONS.labels(self.version, "agree").inc(agreed)
+            SHADOW_COMPARISONS.labels(self.version, "disagree").inc(len(primary) - agreed)
+
+    def record_dropped(self) -> None:
+        with self._lock:
+            self.dropped += 1
+
+    def record_error(self, rows: int) -> None:
+        with self._lock:
+            self.errors += rows
+
+    def snapshot(self) -> dict:
+        """Totals and derived rates for promotion decisions.
+
+        The primary model is timed per request, the candidate per batch, so
+        candidate_ms_per_row is the batch time amortized over its rows and is
+        not comparable to primary_ms_per_call one-to-one. Cache hits are
+        compared but left out of primary_ms_per_call.
+        """
+        with self._lock:
+            compared = self.compared
+            calls = self.primary_calls
+            batches = self.candidate_batches
+            return {
+                "version": self.version,
+                "compared": compared,
+                "agreement_rate": self.agreed / compared if compared else None,
+                "mean_abs_diff": self.abs_diff_total / compared if compared else None,
+                "max_abs_diff": self.max_abs_diff,
+                "primary_ms_per_call": 1000 * self.primary_seconds / calls if calls else None,
+                "candidate_batches": batches,
+                "candidate_mean_batch_size": compared / batches if batches else None,
+                "candidate_ms_per_batch": 1000 * self.candidate_seconds / batches if batches else None,
+                "candidate_ms_per_row": 1000 * self.candidate_seconds / compared if compared else None,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+
+
+class ShadowEvaluator:
+    """Bounded queue plus the batch worker thread that scores the candidate."""
+
+    def __init__(self, version: str):
+        self.version = version
+        self.stats = ShadowStats(version, settings.SHADOW_AGREEMENT_TOLERANCE)
+        self._queue: "queue.Queue[_Item]" = queue.Queue(maxsize=settings.SHADOW_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, features: List[float], primary_score: float, primary_seconds: Optional[float]) -> None:
+        """Mirror one prediction; never blocks."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((features, primary_score, primary_seconds))
+        except queue.Full:
+            self.stats.record_dropped()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[_Item]:
+        batch = [self._queue.get()]
+        while len(batch) < settings.SHADOW_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._score(batch)
+            except Exception as e:
+                logger.error("Shadow evaluation of %s failed: %s", self.version, e)
+                self.stats.record_error(len(batch))
+
+    def _score(self, batch: List[_Item]) -> None:
+        model = ModelLoader.load_candidate_model(self.version)
+        if model is None:
+            self.stats.record_error(len(batch))
+            return
+
+        start = time.perf_counter()
+        candidate = [float(value) for value in model.predict([item[0] for item in batch])]
+        elapsed = time.perf_counter() - start
+        observe("inference", f"risk_{self.version}", elapsed)
+
+        primary = [item[1] for item in batch]
+        primary_timings = [item[2] for item in batch if item[2] is not None]
+        self.stats.record_batch(primary, candidate, primary_timings, elapsed)
+
+    def _reset_after_fork(self) -> None:
+        # The worker thread does not survive fork(); the child starts its own.
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=settings.SHADOW_QUEUE_SIZE)
+
+
+_evaluator: Optional[ShadowEvaluator] = None
+_evaluator_lock = threading.Lock()
+
+
+def get_shadow_evaluator() -> Optional[ShadowEvaluator]:
+    """The evaluator for SHADOW_MODEL_VERSION, or None when shadowing is off."""
+    global _evaluator
+    version = settings.SHADOW_MODEL_VERSION
+    if not version:
+        return None
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = ShadowEvaluator(version)
+                if hasattr(os, "register_at_fork"):
+                    os.register_at_fork(after_in_child=_evaluator._reset_after_fork)
+    return _evaluator
+
+
+def shadow_stats() -> Optional[dict]:
+    """Statistics for the current candidate in this process."""
+    evaluator = _evaluator
+    return evaluator.stats.snapshot() if evaluator is not None else None
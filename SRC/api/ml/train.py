@@ -1,13 +1,12 @@
 """
 Model training script.
+
+scikit-learn is imported inside the training methods so that importing this
+module (e.g. from the worker task registry) does not pay for it.
 """
 import pickle
 from pathlib import Path
 
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-
 from src.api.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +24,8 @@ class ModelTrainer:
         logger.info("Starting risk model training")
         
         try:
+            from sklearn.ensemble import RandomForestClassifier
+
             # Initialize and train model
             model = RandomForestClassifier(n_estimators=100, random_state=42)
             model.fit(X_train, y_train)
@@ -34,10 +35,10 @@ class ModelTrainer:
             with open(model_file, "wb") as f:
                 pickle.dump(model, f)
             
-            logger.info(f"Risk model trained and saved to {model_file}")
+            logger.info("Risk model trained and saved to %s", model_file)
             return model
         except Exception as e:
-            logger.error(f"Error training risk model: {str(e)}")
+            logger.error("Error training risk model: %s", e)
             raise
 
     def train_trend_model(self, X_train, y_train):
@@ -45,6 +46,8 @@ class ModelTrainer:
         logger.info("Starting trend model training")
         
         try:
+            from sklearn.ensemble import RandomForestClassifier
+
             # Initialize and train model
             model = RandomForestClassifier(n_estimators=100, random_state=42)
             model.fit(X_train, y_train)
@@ -54,14 +57,14 @@ class ModelTrainer:
             with open(model_file, "wb") as f:
                 pickle.dump(model, f)
             
-            logger.info(f"Trend model trained and saved to {model_file}")
+            logger.info("Trend model trained and saved to %s", model_file)
             return model
         except Exception as e:
-            logger.error(f"Error training trend model: {str(e)}")
+            logger.error("Error training trend model: %s", e)
             raise
 
     def evaluate_model(self, model, X_test, y_test):
         """Evaluate model performance."""
         score = model.score(X_test, y_test)
-        logger.info(f"Model accuracy: {score:.4f}")
+        logger.info("Model accuracy: %.4f", score)
         return score
@@ -23,3 +23,21 @@ class Accident(Base, IDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Accident(id={self.id}, location={self.location}, severity={self.severity})>"
+
+
+class AccidentDedupKey(Base):
+    """
+    Submission key of an accident, for idempotent ingestion.
+
+    Kept outside the accidents table so the unique index does not constrain
+    how accidents is stored: on a table partitioned by created_at a unique
+    index must include created_at, which would make the key unique only per
+    timestamp.
+    """
+
+    __tablename__ = "accident_dedup_keys"
+
+    # SHA-256 of the client idempotency key or of the normalized payload.
+    dedup_key = Column(String(64), primary_key=True)
+    accident_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)  # the accident's, for partition pruning
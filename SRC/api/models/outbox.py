@@ -0,0 +1,30 @@
+"""
+Outbox model for change events.
+"""
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+
+from .base import Base, IDMixin
+
+
+class OutboxEvent(Base, IDMixin):
+    """A change event written in the same transaction as the change itself."""
+    
+    __tablename__ = "outbox_events"
+
+    aggregate = Column(String(50), nullable=False)  # e.g. accident
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)  # created, updated, deleted
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    published_at = Column(DateTime, nullable=True)
+    stream_offset = Column(String(64), nullable=True)
+
+    # Lets the relay find pending events without scanning published ones.
+    __table_args__ = (
+        Index("ix_outbox_events_pending", "id", postgresql_where=published_at.is_(None)),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, aggregate={self.aggregate}, type={self.event_type})>"
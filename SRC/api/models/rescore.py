@@ -0,0 +1,26 @@
+"""
+Progress model for risk score re-scoring jobs.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from .base import Base
+
+
+class RescoreChunk(Base):
+    """One id range of a re-scoring job and how far it has got."""
+    
+    __tablename__ = "risk_rescore_chunks"
+
+    model_version = Column(String(64), primary_key=True)  # ModelLoader.model_version("risk")
+    start_id = Column(Integer, primary_key=True)
+    end_id = Column(Integer, nullable=False)  # exclusive
+    next_id = Column(Integer, nullable=False)  # rows below this are done
+    scanned = Column(Integer, default=0, nullable=False)
+    changed = Column(Integer, default=0, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RescoreChunk(version={self.model_version}, start={self.start_id}, next={self.next_id})>"
@@ -1,16 +1,76 @@
 """
 Accident repository for data access operations.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
 
+from sqlalchemy import Float, Integer, and_, bindparam, column, delete, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from src.api.core.database import read_only
 from src.api.core.logging import get_logger
-from src.api.models.accident import Accident
-from src.api.schemas.accident_schema import AccidentCreate, AccidentUpdate
+from src.api.core.metrics import timed
+from src.api.models.accident import Accident, AccidentDedupKey
+from src.api.schemas.accident_schema import AccidentCreate, AccidentResponse, AccidentUpdate
 
 logger = get_logger(__name__)
 
+_INSERT_BY_DIALECT = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Hot queries are built once with bound parameters so each call only binds
+# values; the compiled form is reused from the engine's statement cache.
+_SELECT_BY_ID = select(Accident).where(Accident.id == bindparam("accident_id"))
+_SELECT_PAGE = select(Accident).offset(bindparam("skip")).limit(bindparam("limit"))
+# Plain column rows for list responses, skipping ORM hydration.
+_RESPONSE_COLUMNS = [getattr(Accident, name) for name in AccidentResponse.model_fields]
+_SELECT_PAGE_ROWS = select(*_RESPONSE_COLUMNS).offset(bindparam("skip")).limit(bindparam("limit"))
+_SELECT_BY_USER = _SELECT_PAGE.where(Accident.user_id == bindparam("user_id"))
+_SELECT_BY_SEVERITY = _SELECT_PAGE.where(Accident.severity == bindparam("severity"))
+_SELECT_BY_STATUS = _SELECT_PAGE.where(Accident.status == bindparam("status"))
+_SELECT_BY_DEDUP_KEY = (
+    select(Accident)
+    .join(
+        AccidentDedupKey,
+        and_(Accident.id == AccidentDedupKey.accident_id, Accident.created_at == AccidentDedupKey.created_at),
+    )
+    .where(AccidentDedupKey.dedup_key == bindparam("dedup_key"))
+)
+_SELECT_DEDUP_KEYS_SINCE = select(AccidentDedupKey.dedup_key).where(AccidentDedupKey.created_at >= bindparam("since"))
+# Filtering on created_at lets Postgres skip partitions outside the range.
+_SELECT_CREATED_BETWEEN = (
+    select(Accident)
+    .where(Accident.created_at >= bindparam("start"), Accident.created_at < bindparam("end"))
+    .order_by(Accident.created_at.desc())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_SELECT_PAGE_ROWS_SINCE = (
+    select(*_RESPONSE_COLUMNS)
+    .where(Accident.created_at >= bindparam("since"))
+    .order_by(Accident.created_at.desc())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_SELECT_ID_BOUNDS = select(func.min(Accident.id), func.max(Accident.id))
+# Keyset scan over an id range for re-scoring.
+_SELECT_SCORING_ROWS = (
+    select(Accident.id, Accident.location, Accident.severity, Accident.risk_score)
+    .where(Accident.id >= bindparam("start_id"), Accident.id < bindparam("end_id"))
+    .order_by(Accident.id)
+    .limit(bindparam("limit"))
+)
+# Re-scoring is not an edit, so updated_at keeps its value.
+_UPDATE_RISK_SCORE = (
+    update(Accident)
+    .where(Accident.id == bindparam("accident_id"))
+    .values(risk_score=bindparam("score"), updated_at=Accident.updated_at)
+)
+_COUNT_ALL = select(func.count()).select_from(Accident)
+_COUNT_BY_SEVERITY = _COUNT_ALL.where(Accident.severity == bindparam("severity"))
+
 
 class AccidentRepository:
     """Repository for accident data access operations."""
@@ -18,62 +78,164 @@ class AccidentRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @timed("repository")
     def create(self, accident_data: AccidentCreate, user_id: Optional[int] = None) -> Accident:
         """Create a new accident in the database."""
-        db_accident = Accident(**accident_data.dict(), user_id=user_id)
-        self.db.add(db_accident)
+        stmt = insert(Accident).values(**accident_data.dict(), user_id=user_id).returning(Accident)
+        db_accident = self.db.scalars(stmt).one()
         self.db.commit()
-        self.db.refresh(db_accident)
         return db_accident
 
+    @timed("repository")
+    def create_if_absent(self, values: dict, dedup_key: str) -> Optional[Accident]:
+        """
+        Insert an accident and claim its dedup key; roll back and return None if
+        the key is taken. On success the caller commits.
+        """
+        db_accident = self.db.scalars(insert(Accident).values(**values).returning(Accident)).one()
+        dialect_insert = _INSERT_BY_DIALECT[self.db.get_bind().dialect.name]
+        claim = (
+            dialect_insert(AccidentDedupKey)
+            .values(dedup_key=dedup_key, accident_id=db_accident.id, created_at=db_accident.created_at)
+            .on_conflict_do_nothing(index_elements=[AccidentDedupKey.dedup_key])
+            .returning(AccidentDedupKey.dedup_key)
+        )
+        if self.db.execute(claim).first() is None:
+            self.db.rollback()
+            return None
+        return db_accident
+
+    @timed("repository")
+    def get_by_dedup_key(self, dedup_key: str) -> Optional[Accident]:
+        """Get an accident by dedup key, always from the primary so fresh inserts are seen."""
+        return self.db.scalars(_SELECT_BY_DEDUP_KEY, {"dedup_key": dedup_key}).first()
+
+    @timed("repository")
+    @read_only
+    def get_dedup_keys_since(self, since: datetime) -> List[str]:
+        """Dedup keys of accidents created since a point in time."""
+        return list(self.db.scalars(_SELECT_DEDUP_KEYS_SINCE, {"since": since}))
+
+    @timed("repository")
+    @read_only
     def get_by_id(self, accident_id: int) -> Optional[Accident]:
         """Get an accident by ID."""
-        return self.db.query(Accident).filter(Accident.id == accident_id).first()
+        return self.db.scalars(_SELECT_BY_ID, {"accident_id": accident_id}).first()
 
+    @timed("repository")
+    @read_only
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get all accidents with pagination."""
-        return self.db.query(Accident).offset(skip).limit(limit).all()
-
+        return list(self.db.scalars(_SELECT_PAGE, {"skip": skip, "limit": limit}))
+
+    @timed("repository")
+    @read_only
+    def get_page_rows(self, skip: int = 0, limit: int = 100, since: Optional[datetime] = None) -> List[Row]:
+        """
+        Get a page of accidents as rows holding only the AccidentResponse columns.
+
+        With since, only accidents created from then on are read, newest first.
+        """
+        if since is not None:
+            return self.db.execute(_SELECT_PAGE_ROWS_SINCE, {"since": since, "skip": skip, "limit": limit}).all()
+        return self.db.execute(_SELECT_PAGE_ROWS, {"skip": skip, "limit": limit}).all()
+
+    @timed("repository")
+    @read_only
+    def get_created_between(self, start: datetime, end: datetime, skip: int = 0, limit: int = 100) -> List[Accident]:
+        """Get accidents created in [start, end), newest first."""
+        params = {"start": start, "end": end, "skip": skip, "limit": limit}
+        return list(self.db.scalars(_SELECT_CREATED_BETWEEN, params))
+
+    @timed("repository")
+    @read_only
     def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get accidents by user."""
-        return self.db.query(Accident).filter(Accident.user_id == user_id).offset(skip).limit(limit).all()
+        params = {"user_id": user_id, "skip": skip, "limit": limit}
+        return list(self.db.scalars(_SELECT_BY_USER, params))
 
+    @timed("repository")
+    @read_only
     def get_by_severity(self, severity: str, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get accidents filtered by severity."""
-        return self.db.query(Accident).filter(Accident.severity == severity).offset(skip).limit(limit).all()
+        params = {"severity": severity, "skip": skip, "limit": limit}
+        return list(self.db.scalars(_SELECT_BY_SEVERITY, params))
 
+    @timed("repository")
+    @read_only
     def get_by_status(self, status: str, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get accidents filtered by status."""
-        return self.db.query(Accident).filter(Accident.status == status).offset(skip).limit(limit).all()
+        params = {"status": status, "skip": skip, "limit": limit}
+        return list(self.db.scalars(_SELECT_BY_STATUS, params))
 
+    @timed("repository")
     def update(self, accident_id: int, accident_data: AccidentUpdate) -> Optional[Accident]:
         """Update an accident."""
-        accident = self.get_by_id(accident_id)
+        update_data = accident_data.dict(exclude_unset=True)
+        if not update_data:
+            return self.db.scalars(_SELECT_BY_ID, {"accident_id": accident_id}).first()
+        
+        stmt = update(Accident).where(Accident.id == accident_id).values(**update_data).returning(Accident)
+        accident = self.db.scalars(stmt).first()
         if not accident:
             return None
         
-        update_data = accident_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(accident, key, value)
-        
         self.db.commit()
-        self.db.refresh(accident)
         return accident
 
+    @timed("repository")
     def delete(self, accident_id: int) -> bool:
         """Delete an accident."""
-        accident = self.get_by_id(accident_id)
-        if not accident:
+        stmt = delete(Accident).where(Accident.id == accident_id).returning(Accident.id)
+        if self.db.execute(stmt).first() is None:
             return False
         
-        self.db.delete(accident)
         self.db.commit()
         return True
 
+    @timed("repository")
+    def get_id_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        """Smallest and largest accident id, or (None, None), always from the primary."""
+        return tuple(self.db.execute(_SELECT_ID_BOUNDS).one())
+
+    @timed("repository")
+    def get_scoring_rows(self, start_id: int, end_id: int, limit: int = 1000) -> List[Row]:
+        """
+        (id, location, severity, risk_score) rows with start_id <= id < end_id, in id order.
+
+        Read from the primary, in the caller's transaction: a lagging replica
+        would end a chunk early and overwrite scores of newer edits.
+        """
+        params = {"start_id": start_id, "end_id": end_id, "limit": limit}
+        return list(self.db.execute(_SELECT_SCORING_ROWS, params))
+
+    @timed("repository")
+    def update_risk_scores(self, scores: Sequence[Tuple[int, float]]) -> None:
+        """Set the risk score of many accidents in one statement; the caller commits."""
+        if not scores:
+            return
+        if self.db.get_bind().dialect.name == "postgresql":
+            # UPDATE ... FROM (VALUES ...): one statement and one round trip per batch.
+            rows = values(column("id", Integer), column("risk_score", Float), name="scores").data(list(scores))
+            stmt = (
+                update(Accident)
+                .where(Accident.id == rows.c.id)
+                .values(risk_score=rows.c.risk_score, updated_at=Accident.updated_at)
+            )
+            self.db.execute(stmt)
+        else:
+            self.db.connection().execute(
+                _UPDATE_RISK_SCORE, [{"accident_id": accident_id, "score": score} for accident_id, score in scores]
+            )
+
+    @timed("repository")
+    @read_only
     def count(self) -> int:
         """Count total accidents."""
-        return self.db.query(Accident).count()
+        return self.db.scalar(_COUNT_ALL)
 
+    @timed("repository")
+    @read_only
     def count_by_severity(self, severity: str) -> int:
         """Count accidents by severity."""
-        return self.db.query(Accident).filter(Accident.severity == severity).count()
+        return self.db.scalar(_COUNT_BY_SEVERITY, {"severity": severity})
@@ -0,0 +1,73 @@
+"""
+Outbox repository for change event storage.
+"""
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.models.outbox import OutboxEvent
+
+logger = get_logger(__name__)
+
+_INSERT_EVENT = insert(OutboxEvent)
+# Oldest first. A second relay waits on the lock rather than skipping ahead,
+# which would let it publish later events before this batch.
+_SELECT_PENDING = (
+    select(OutboxEvent)
+    .where(OutboxEvent.published_at.is_(None))
+    .order_by(OutboxEvent.id)
+    .limit(bindparam("limit"))
+    .with_for_update()
+)
+_MARK_PUBLISHED = (
+    update(OutboxEvent)
+    .where(OutboxEvent.id == bindparam("event_id"))
+    .values(published_at=bindparam("published"), stream_offset=bindparam("offset"))
+)
+_DELETE_PUBLISHED_BEFORE = delete(OutboxEvent).where(
+    OutboxEvent.published_at.is_not(None), OutboxEvent.published_at < bindparam("before")
+)
+
+
+class OutboxRepository:
+    """Repository for outbox events. Writes join the caller's transaction and are not committed here."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @timed("repository")
+    def add(self, aggregate: str, aggregate_id: int, event_type: str, payload: dict) -> None:
+        """Queue an event in the current transaction."""
+        self.db.execute(_INSERT_EVENT, {
+            "aggregate": aggregate,
+            "aggregate_id": aggregate_id,
+            "event_type": event_type,
+            "payload": payload,
+            "created_at": datetime.utcnow(),
+        })
+
+    @timed("repository")
+    def get_pending(self, limit: int = 500) -> List[OutboxEvent]:
+        """Lock and return the oldest unpublished events."""
+        return list(self.db.scalars(_SELECT_PENDING, {"limit": limit}))
+
+    @timed("repository")
+    def mark_published(self, offsets: Sequence[Tuple[int, str]]) -> None:
+        """Record the stream offset of each published (event id, offset) pair."""
+        if not offsets:
+            return
+        now = datetime.utcnow()
+        # Plain Core update with executemany; the ORM bulk path would expect primary-key parameters.
+        self.db.connection().execute(
+            _MARK_PUBLISHED,
+            [{"event_id": event_id, "offset": offset, "published": now} for event_id, offset in offsets],
+        )
+
+    @timed("repository")
+    def delete_published_before(self, before: datetime) -> int:
+        """Remove published events older than a point in time."""
+        return self.db.execute(_DELETE_PUBLISHED_BEFORE, {"before": before}).rowcount
@@ -0,0 +1,87 @@
+"""
+Rescore repository for re-scoring job progress.
+"""
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.models.rescore import RescoreChunk
+
+logger = get_logger(__name__)
+
+_INSERT_BY_DIALECT = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+_SELECT_CHUNKS = (
+    select(RescoreChunk).where(RescoreChunk.model_version == bindparam("version")).order_by(RescoreChunk.start_id)
+)
+# Locked while a batch of the chunk is scored, so a redelivered task waits and
+# then continues from the advanced cursor instead of redoing the batch.
+_SELECT_CHUNK_FOR_UPDATE = (
+    select(RescoreChunk)
+    .where(RescoreChunk.model_version == bindparam("version"), RescoreChunk.start_id == bindparam("start_id"))
+    .with_for_update()
+    .execution_options(populate_existing=True)
+)
+_ADVANCE_CHUNK = (
+    update(RescoreChunk)
+    .where(RescoreChunk.model_version == bindparam("version"), RescoreChunk.start_id == bindparam("chunk_start"))
+    .values(
+        next_id=bindparam("cursor"),
+        scanned=RescoreChunk.scanned + bindparam("scanned_rows"),
+        changed=RescoreChunk.changed + bindparam("changed_rows"),
+        finished_at=bindparam("finished"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+
+class RescoreRepository:
+    """Repository for re-scoring progress. Writes join the caller's transaction and are not committed here."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @timed("repository")
+    def get_chunks(self, version: str) -> List[RescoreChunk]:
+        """Every chunk of the job for a model version, in id order."""
+        return list(self.db.scalars(_SELECT_CHUNKS, {"version": version}))
+
+    @timed("repository")
+    def add_chunks(self, version: str, ranges: Sequence[Tuple[int, int]]) -> None:
+        """Create chunks for (start_id, end_id) ranges, skipping ones that already exist."""
+        if not ranges:
+            return
+        dialect_insert = _INSERT_BY_DIALECT[self.db.get_bind().dialect.name]
+        stmt = dialect_insert(RescoreChunk).on_conflict_do_nothing(
+            index_elements=[RescoreChunk.model_version, RescoreChunk.start_id]
+        )
+        now = datetime.utcnow()
+        self.db.execute(stmt, [
+            {"model_version": version, "start_id": start, "end_id": end, "next_id": start,
+             "scanned": 0, "changed": 0, "updated_at": now}
+            for start, end in ranges
+        ])
+
+    @timed("repository")
+    def lock_chunk(self, version: str, start_id: int) -> Optional[RescoreChunk]:
+        """Lock a chunk for the rest of the transaction and return it."""
+        return self.db.scalars(_SELECT_CHUNK_FOR_UPDATE, {"version": version, "start_id": start_id}).first()
+
+    @timed("repository")
+    def advance(self, version: str, start_id: int, next_id: int, scanned: int, changed: int,
+                finished: bool = False) -> None:
+        """Move a chunk's cursor and add to its counters."""
+        self.db.execute(_ADVANCE_CHUNK, {
+            "version": version,
+            "chunk_start": start_id,
+            "cursor": next_id,
+            "scanned_rows": scanned,
+            "changed_rows": changed,
+            "finished": datetime.utcnow() if finished else None,
+        })
@@ -3,14 +3,36 @@ User repository for data access operations.
 """
 from typing import List, Optional
 
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from src.api.core.database import read_only
 from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.models.accident import Accident
 from src.api.models.user import User
-from src.api.schemas.user_schema import UserCreate, UserUpdate
+from src.api.schemas.user_schema import UserCreate, UserResponse, UserUpdate
 
 logger = get_logger(__name__)
 
+# Hot queries are built once with bound parameters so each call only binds
+# values; the compiled form is reused from the engine's statement cache.
+_SELECT_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_SELECT_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_SELECT_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_SELECT_PAGE = select(User).offset(bindparam("skip")).limit(bindparam("limit"))
+# Column-only select matching UserResponse.
+_RESPONSE_COLUMNS = [getattr(User, name) for name in UserResponse.model_fields]
+_SELECT_PAGE_ROWS = select(*_RESPONSE_COLUMNS).offset(bindparam("skip")).limit(bindparam("limit"))
+_COUNT_ALL = select(func.count()).select_from(User)
+# Notification recipients, resolved in one query however many users match.
+_RECIPIENT_COLUMNS = select(User.id, User.email, User.full_name).where(User.is_active.is_(True))
+_SELECT_RECIPIENTS_BY_IDS = _RECIPIENT_COLUMNS.where(User.id.in_(bindparam("user_ids", expanding=True)))
+_SELECT_RECIPIENTS_BY_LOCATION = _RECIPIENT_COLUMNS.where(
+    User.id.in_(select(Accident.user_id).where(Accident.location == bindparam("location")))
+)
+
 
 class UserRepository:
     """Repository for user data access operations."""
@@ -18,54 +40,82 @@ class UserRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    @timed("repository")
     def create(self, user_data: UserCreate) -> User:
         """Create a new user in the database."""
-        db_user = User(**user_data.dict(exclude={"password"}))
-        self.db.add(db_user)
+        stmt = insert(User).values(**user_data.dict(exclude={"password"})).returning(User)
+        db_user = self.db.scalars(stmt).one()
         self.db.commit()
-        self.db.refresh(db_user)
         return db_user
 
+    @timed("repository")
+    @read_only
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.scalars(_SELECT_BY_ID, {"user_id": user_id}).first()
 
+    @timed("repository")
+    @read_only
     def get_by_username(self, username: str) -> Optional[User]:
         """Get a user by username."""
-        return self.db.query(User).filter(User.username == username).first()
+        return self.db.scalars(_SELECT_BY_USERNAME, {"username": username}).first()
 
+    @timed("repository")
+    @read_only
     def get_by_email(self, email: str) -> Optional[User]:
         """Get a user by email."""
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(_SELECT_BY_EMAIL, {"email": email}).first()
 
+    @timed("repository")
+    @read_only
     def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users with pagination."""
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return list(self.db.scalars(_SELECT_PAGE, {"skip": skip, "limit": limit}))
+
+    @timed("repository")
+    @read_only
+    def get_page_rows(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        """Get a page of users as rows holding only the UserResponse columns."""
+        return self.db.execute(_SELECT_PAGE_ROWS, {"skip": skip, "limit": limit}).all()
 
+    @timed("repository")
+    @read_only
+    def get_notification_recipients(self, user_ids: Optional[List[int]] = None,
+                                    location: Optional[str] = None) -> List[Row]:
+        """Get (id, email, full_name) of active users by id, or of those who reported accidents at a location."""
+        if user_ids is not None:
+            return self.db.execute(_SELECT_RECIPIENTS_BY_IDS, {"user_ids": user_ids}).all()
+        if location is not None:
+            return self.db.execute(_SELECT_RECIPIENTS_BY_LOCATION, {"location": location}).all()
+        return []
+
+    @timed("repository")
     def update(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update a user."""
-        user = self.get_by_id(user_id)
+        update_data = user_data.dict(exclude_unset=True)
+        if not update_data:
+            return self.db.scalars(_SELECT_BY_ID, {"user_id": user_id}).first()
+        
+        stmt = update(User).where(User.id == user_id).values(**update_data).returning(User)
+        user = self.db.scalars(stmt).first()
         if not user:
             return None
         
-        update_data = user_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(user, key, value)
-        
         self.db.commit()
-        self.db.refresh(user)
         return user
 
+    @timed("repository")
     def delete(self, user_id: int) -> bool:
         """Delete a user."""
-        user = self.get_by_id(user_id)
-        if not user:
+        stmt = delete(User).where(User.id == user_id).returning(User.id)
+        if self.db.execute(stmt).first() is None:
             return False
         
-        self.db.delete(user)
         self.db.commit()
         return True
 
+    @timed("repository")
+    @read_only
     def count(self) -> int:
         """Count total users."""
-        return self.db.query(User).count()
+        return self.db.scalar(_COUNT_ALL)
@@ -2,9 +2,9 @@
 Pydantic schemas for Accident models.
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class AccidentBase(BaseModel):
@@ -47,3 +47,7 @@ class AccidentResponse(AccidentBase):
 
     class Config:
         from_attributes = True
+
+
+# Validates and serializes whole pages in one call instead of model by model.
+AccidentResponseList = TypeAdapter(List[AccidentResponse])
@@ -2,9 +2,9 @@
 Pydantic schemas for User models.
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 
 
 class UserBase(BaseModel):
@@ -47,3 +47,7 @@ class UserLogin(BaseModel):
     
     username: str
     password: str
+
+
+# Bulk validator/serializer for list endpoints.
+UserResponseList = TypeAdapter(List[UserResponse])
@@ -1,100 +1,230 @@
 """
 Accident business logic service.
 """
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
 from typing import List, Optional
 
+import orjson
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
+from src.api.core.admission import admission
+from src.api.core.bloom import BloomFilter
 from src.api.core.logging import get_logger
+from src.api.core.metrics import ACCIDENT_DUPLICATES, timed, timer
+from src.api.core.profiling import profiled
+from src.api.core.rate_limit import check_rate_limit
+from src.api.core.serialization import rows_to_json
+from src.api.core.settings import settings
 from src.api.models.accident import Accident
-from src.api.schemas.accident_schema import AccidentCreate, AccidentUpdate
+from src.api.repositories.accident_repository import AccidentRepository
+from src.api.schemas.accident_schema import AccidentCreate, AccidentResponseList, AccidentUpdate
+from src.api.services.event_service import CREATED, DELETED, UPDATED, ChangeEventService
 from src.api.services.prediction_service import PredictionService
 
 logger = get_logger(__name__)
 
+# Dedup keys of accidents this process has seen, seeded from the database.
+# A miss means the key is certainly new, so the lookup query is skipped.
+_seen_keys: Optional[BloomFilter] = None
+_seen_keys_built_at = 0.0
+_seen_keys_lock = threading.Lock()
+
+
+def _dedup_filter(db: Session) -> BloomFilter:
+    global _seen_keys, _seen_keys_built_at
+    # Payload keys match over two windows: the current and the previous one.
+    retention = max(settings.ACCIDENT_IDEMPOTENCY_WINDOW_S, 2 * settings.ACCIDENT_DEDUP_WINDOW_S)
+    with _seen_keys_lock:
+        stale = time.monotonic() - _seen_keys_built_at > retention
+        if _seen_keys is None or (_seen_keys.is_full() and stale):
+            bloom = BloomFilter(settings.ACCIDENT_DEDUP_BLOOM_CAPACITY, settings.ACCIDENT_DEDUP_BLOOM_ERROR_RATE)
+            since = datetime.utcnow() - timedelta(seconds=retention)
+            for key in AccidentRepository(db).get_dedup_keys_since(since):
+                bloom.add(key)
+            _seen_keys, _seen_keys_built_at = bloom, time.monotonic()
+        return _seen_keys
+
+
+def _record_duplicate(accident: Accident, idempotency_key: Optional[str]) -> None:
+    if settings.METRICS_ENABLED:
+        ACCIDENT_DUPLICATES.labels("key" if idempotency_key else "payload").inc()
+    logger.info("Duplicate accident submission, returning %s", accident.id)
+
 
 class AccidentService:
     """Service for accident-related business logic."""
 
     @staticmethod
-    def create_accident(db: Session, accident_data: AccidentCreate, user_id: Optional[int] = None) -> Accident:
-        """Create a new accident."""
-        logger.info(f"Creating accident at location: {accident_data.location}")
+    def dedup_key(accident_data: AccidentCreate, user_id: Optional[int] = None,
+                  idempotency_key: Optional[str] = None, now: Optional[float] = None) -> str:
+        """
+        Key identifying a submission: the client's idempotency key if given,
+        otherwise the normalized payload within the current dedup window.
+        """
+        if idempotency_key:
+            material = f"key:{user_id}:{idempotency_key}".encode()
+        else:
+            normalized = {
+                "user_id": user_id,
+                "location": " ".join(accident_data.location.split()).casefold(),
+                "latitude": None if accident_data.latitude is None else round(accident_data.latitude, 5),
+                "longitude": None if accident_data.longitude is None else round(accident_data.longitude, 5),
+                "severity": accident_data.severity.lower(),
+                "description": " ".join((accident_data.description or "").split()),
+                "window": int((now or time.time()) // settings.ACCIDENT_DEDUP_WINDOW_S),
+            }
+            material = orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(material).hexdigest()
+
+    @staticmethod
+    def dedup_lookup_keys(accident_data: AccidentCreate, user_id: Optional[int] = None,
+                          idempotency_key: Optional[str] = None, now: Optional[float] = None) -> List[str]:
+        """
+        Keys an earlier copy of a submission may be stored under, the key to store it under first.
+
+        Payload keys also include the previous window's key, so a resend just
+        after a window boundary still matches.
+        """
+        now = now or time.time()
+        keys = [AccidentService.dedup_key(accident_data, user_id, idempotency_key, now)]
+        if not idempotency_key:
+            keys.append(AccidentService.dedup_key(accident_data, user_id, None, now - settings.ACCIDENT_DEDUP_WINDOW_S))
+        return keys
+
+    @staticmethod
+    @timed("service")
+    @profiled()
+    def create_accident(db: Session, accident_data: AccidentCreate, user_id: Optional[int] = None,
+                        idempotency_key: Optional[str] = None) -> Accident:
+        """
+        Create a new accident, or return the existing one if this submission was already stored.
+
+        Raises RateLimitExceeded or Overloaded before predicting when the
+        caller or the server is over its limits.
+        """
+        logger.info("Creating accident at location: %s", accident_data.location)
         
-        # Calculate risk score using ML prediction
-        risk_score = PredictionService.predict_risk(
-            location=accident_data.location,
-            severity=accident_data.severity
-        )
+        dedup_key = None
+        if settings.ACCIDENT_DEDUP_ENABLED or idempotency_key:
+            keys = AccidentService.dedup_lookup_keys(accident_data, user_id, idempotency_key)
+            dedup_key = keys[0]
+            for key in keys:
+                if _dedup_filter(db).might_contain(key):
+                    existing = AccidentRepository(db).get_by_dedup_key(key)
+                    if existing is not None:
+                        _record_duplicate(existing, idempotency_key)
+                        return existing
         
-        db_accident = Accident(
-            user_id=user_id,
-            location=accident_data.location,
-            latitude=accident_data.latitude,
-            longitude=accident_data.longitude,
-            severity=accident_data.severity,
-            description=accident_data.description,
-            risk_score=risk_score,
-        )
-        db.add(db_accident)
-        db.commit()
-        db.refresh(db_accident)
+        # Repeated submissions are answered above without spending a token.
+        check_rate_limit("create_accident", user_id)
+        with admission("create_accident"):
+            # Calculate risk score using ML prediction
+            risk_score = PredictionService.predict_risk(
+                location=accident_data.location,
+                severity=accident_data.severity
+            )
+        
+            values = dict(
+                user_id=user_id,
+                location=accident_data.location,
+                latitude=accident_data.latitude,
+                longitude=accident_data.longitude,
+                severity=accident_data.severity,
+                description=accident_data.description,
+                risk_score=risk_score,
+            )
+            if dedup_key is None:
+                db_accident = db.scalars(insert(Accident).values(**values).returning(Accident)).one()
+            else:
+                repository = AccidentRepository(db)
+                db_accident = repository.create_if_absent(values, dedup_key)
+                _dedup_filter(db).add(dedup_key)
+                if db_accident is None:
+                    # An identical submission was inserted concurrently.
+                    db_accident = repository.get_by_dedup_key(dedup_key)
+                    _record_duplicate(db_accident, idempotency_key)
+                    return db_accident
+            ChangeEventService.record_accident_event(db, CREATED, db_accident)
+            db.commit()
         
-        logger.info(f"Accident created successfully: {db_accident.id} (Risk Score: {risk_score})")
+        logger.info("Accident created successfully: %s (Risk Score: %s)", db_accident.id, risk_score)
         return db_accident
 
     @staticmethod
+    @timed("service")
     def get_accident_by_id(db: Session, accident_id: int) -> Optional[Accident]:
         """Get an accident by ID."""
         return db.query(Accident).filter(Accident.id == accident_id).first()
 
     @staticmethod
+    @timed("service")
     def get_all_accidents(db: Session, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get all accidents with pagination."""
         return db.query(Accident).offset(skip).limit(limit).all()
 
     @staticmethod
+    @timed("service")
+    def get_all_accidents_json(db: Session, skip: int = 0, limit: int = 100, validate: bool = True,
+                               since: Optional[datetime] = None) -> bytes:
+        """Get a page of accidents as JSON bytes; validate=False skips pydantic for trusted rows."""
+        rows = AccidentRepository(db).get_page_rows(skip, limit, since)
+        with timer("serialization", "accidents"):
+            if not validate:
+                return rows_to_json(rows)
+            return AccidentResponseList.dump_json(AccidentResponseList.validate_python(rows, from_attributes=True))
+
+    @staticmethod
+    @timed("service")
     def get_accidents_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get accidents by user."""
         return db.query(Accident).filter(Accident.user_id == user_id).offset(skip).limit(limit).all()
 
     @staticmethod
+    @timed("service")
     def get_accidents_by_severity(db: Session, severity: str, skip: int = 0, limit: int = 100) -> List[Accident]:
         """Get accidents filtered by severity."""
         return db.query(Accident).filter(Accident.severity == severity).offset(skip).limit(limit).all()
 
     @staticmethod
+    @timed("service")
     def update_accident(db: Session, accident_id: int, accident_data: AccidentUpdate) -> Optional[Accident]:
         """Update an accident."""
-        logger.info(f"Updating accident: {accident_id}")
+        logger.info("Updating accident: %s", accident_id)
         
-        accident = db.query(Accident).filter(Accident.id == accident_id).first()
+        update_data = accident_data.dict(exclude_unset=True)
+        if update_data:
+            stmt = update(Accident).where(Accident.id == accident_id).values(**update_data).returning(Accident)
+            accident = db.scalars(stmt).first()
+        else:
+            accident = db.query(Accident).filter(Accident.id == accident_id).first()
         if not accident:
-            logger.warning(f"Accident not found: {accident_id}")
+            logger.warning("Accident not found: %s", accident_id)
             return None
         
-        update_data = accident_data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(accident, key, value)
-        
+        if update_data:
+            ChangeEventService.record_accident_event(db, UPDATED, accident)
         db.commit()
-        db.refresh(accident)
         
-        logger.info(f"Accident updated successfully: {accident_id}")
+        logger.info("Accident updated successfully: %s", accident_id)
         return accident
 
     @staticmethod
+    @timed("service")
     def delete_accident(db: Session, accident_id: int) -> bool:
         """Delete an accident."""
-        logger.info(f"Deleting accident: {accident_id}")
+        logger.info("Deleting accident: %s", accident_id)
         
-        accident = db.query(Accident).filter(Accident.id == accident_id).first()
-        if not accident:
-            logger.warning(f"Accident not found: {accident_id}")
+        stmt = delete(Accident).where(Accident.id == accident_id).returning(Accident.id)
+        if db.execute(stmt).first() is None:
+            logger.warning("Accident not found: %s", accident_id)
             return False
         
-        db.delete(accident)
+        ChangeEventService.record_accident_event(db, DELETED, accident_id=accident_id)
         db.commit()
         
-        logger.info(f"Accident deleted successfully: {accident_id}")
+        logger.info("Accident deleted successfully: %s", accident_id)
         return True
@@ -0,0 +1,86 @@
+"""
+Change event business logic: recording events in the outbox and relaying them.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from src.api.core.event_stream import EventStream, get_event_stream
+from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.core.settings import settings
+from src.api.models.accident import Accident
+from src.api.repositories.outbox_repository import OutboxRepository
+from src.api.schemas.accident_schema import AccidentResponse
+
+logger = get_logger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+class ChangeEventService:
+    """Service for change events, written through the transactional outbox."""
+
+    @staticmethod
+    def record_accident_event(db: Session, event_type: str, accident: Optional[Accident] = None,
+                              accident_id: Optional[int] = None) -> None:
+        """
+        Add an accident change event to the caller's open transaction.
+
+        The event is stored only if the caller commits, so it can never
+        describe a change that was rolled back.
+        """
+        if not settings.CHANGE_EVENTS_ENABLED:
+            return
+        if accident is not None:
+            accident_id = accident.id
+            payload = AccidentResponse.model_validate(accident).model_dump(mode="json")
+        else:
+            payload = {"id": accident_id}
+        OutboxRepository(db).add("accident", accident_id, event_type, payload)
+
+    @staticmethod
+    @timed("service")
+    def relay(db: Session, stream: Optional[EventStream] = None, batch_size: Optional[int] = None) -> int:
+        """
+        Publish one batch of pending outbox events to the stream, oldest first.
+
+        The batch stays locked until it is marked published, so concurrent
+        relays never publish the same rows. If the process dies between the
+        append and the commit the batch is published again, which consumers
+        absorb by skipping event_ids they have seen.
+        """
+        stream = stream or get_event_stream()
+        pending = OutboxRepository(db).get_pending(batch_size or settings.OUTBOX_RELAY_BATCH_SIZE)
+        if not pending:
+            db.rollback()
+            return 0
+
+        offsets = stream.append_batch([
+            {
+                "event_id": event.id,
+                "aggregate": event.aggregate,
+                "aggregate_id": event.aggregate_id,
+                "type": event.event_type,
+                "occurred_at": event.created_at.isoformat(),
+                "data": event.payload,
+            }
+            for event in pending
+        ])
+        OutboxRepository(db).mark_published([(event.id, offset) for event, offset in zip(pending, offsets)])
+        db.commit()
+
+        logger.info("Relayed %s change events up to %s", len(pending), offsets[-1])
+        return len(pending)
+
+    @staticmethod
+    @timed("service")
+    def purge_published(db: Session, retention_s: Optional[int] = None) -> int:
+        """Delete published events older than the retention period."""
+        retention_s = settings.OUTBOX_RETENTION_S if retention_s is None else retention_s
+        deleted = OutboxRepository(db).delete_published_before(datetime.utcnow() - timedelta(seconds=retention_s))
+        db.commit()
+        return deleted
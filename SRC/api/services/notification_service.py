@@ -0,0 +1,168 @@
+"""
+Notification fan-out service.
+
+A fan-out resolves every recipient with a single query, drops recipients who
+already received the same message on a channel within
+NOTIFICATION_DEDUP_WINDOW_S, and splits the rest into batches of
+NOTIFICATION_BATCH_SIZE. Each batch is delivered through the channel's
+transport, paced by a per-channel token bucket.
+
+Recipients are claimed when the batches are planned so that concurrent
+fan-outs do not both send. A claim is released when its batch is not
+delivered (enqueueing failed or the delivery gave up), so a later attempt can
+still reach those recipients; retries of a delivery do not check the claim.
+"""
+import hashlib
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.core.notification_transports import Recipient, get_transport
+from src.api.core.settings import settings
+from src.api.repositories.user_repository import UserRepository
+
+logger = get_logger(__name__)
+
+
+class ChannelRateLimiter:
+    """Blocking token bucket per channel; rates come from NOTIFICATION_RATE_LIMITS."""
+
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = rates
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, channel: str, count: int = 1) -> None:
+        """Wait until count sends are allowed on the channel."""
+        rate = self.rates.get(channel)
+        if not rate:
+            return
+        for _ in range(count):
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    tokens, last = self._buckets.get(channel, (rate, now))
+                    tokens = min(rate, tokens + (now - last) * rate)
+                    if tokens >= 1:
+                        self._buckets[channel] = (tokens - 1, now)
+                        break
+                    self._buckets[channel] = (tokens, now)
+                    wait = (1 - tokens) / rate
+                time.sleep(wait)
+
+
+class RecentNotifications:
+    """
+    Remembers (channel, user, message) deliveries for the dedup window.
+
+    Uses Redis (SET NX EX) so every worker shares the window; without the
+    redis client it falls back to a per-process dict.
+    """
+
+    def __init__(self, url: Optional[str], window: int):
+        self.window = window
+        self._redis = None
+        self._local: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        try:
+            import redis
+
+            self._redis = redis.Redis.from_url(url) if url else None
+        except ImportError:
+            logger.warning("redis is not installed; notification dedup is per process")
+
+    @staticmethod
+    def _key(channel: str, user_id: int, message: str) -> str:
+        digest = hashlib.sha1(message.encode()).hexdigest()
+        return f"notify:{channel}:{user_id}:{digest}"
+
+    def claim(self, channel: str, recipients: List[Recipient], message: str) -> List[Recipient]:
+        """Return the recipients not notified recently, marking them as notified."""
+        keys = [self._key(channel, r["id"], message) for r in recipients]
+        if self._redis is not None:
+            pipe = self._redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, 1, nx=True, ex=self.window)
+            claimed = pipe.execute()
+        else:
+            now = time.monotonic()
+            with self._lock:
+                self._local = {k: exp for k, exp in self._local.items() if exp > now}
+                claimed = []
+                for key in keys:
+                    claimed.append(key not in self._local)
+                    self._local.setdefault(key, now + self.window)
+        return [r for r, ok in zip(recipients, claimed) if ok]
+
+    def release(self, channel: str, recipients: List[Recipient], message: str) -> None:
+        """Forget claims for recipients that were not notified after all."""
+        keys = [self._key(channel, r["id"], message) for r in recipients]
+        if not keys:
+            return
+        if self._redis is not None:
+            self._redis.delete(*keys)
+        else:
+            with self._lock:
+                for key in keys:
+                    self._local.pop(key, None)
+
+
+_rate_limiter = ChannelRateLimiter(settings.NOTIFICATION_RATE_LIMITS)
+_recent: Optional[RecentNotifications] = None
+
+
+def _recent_notifications() -> RecentNotifications:
+    global _recent
+    if _recent is None:
+        _recent = RecentNotifications(
+            settings.NOTIFICATION_DEDUP_URL or settings.CELERY_BROKER_URL, settings.NOTIFICATION_DEDUP_WINDOW_S
+        )
+    return _recent
+
+
+class NotificationService:
+    """Service for resolving, batching and delivering notifications."""
+
+    @staticmethod
+    @timed("service")
+    def resolve_recipients(db: Session, user_ids: Optional[List[int]] = None,
+                           location: Optional[str] = None) -> List[Recipient]:
+        """Look up active recipients by id or by accident location in one query."""
+        rows = UserRepository(db).get_notification_recipients(user_ids=user_ids, location=location)
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def plan_batches(channel: str, recipients: List[Recipient], message: str,
+                     dedup: bool = True) -> Iterator[List[Recipient]]:
+        """Claim and keep recipients not notified recently (all of them without dedup), in delivery batches."""
+        fresh = recipients
+        if dedup:
+            fresh = _recent_notifications().claim(channel, recipients, message)
+            skipped = len(recipients) - len(fresh)
+            if skipped:
+                logger.info("Skipping %s duplicate %s notifications", skipped, channel)
+        size = settings.NOTIFICATION_BATCH_SIZE
+        for start in range(0, len(fresh), size):
+            yield fresh[start:start + size]
+
+    @staticmethod
+    @timed("service")
+    def deliver(channel: str, recipients: List[Recipient], subject: str, message: str) -> int:
+        """Send one batch through the channel transport, respecting its rate limit."""
+        transport = get_transport(channel)
+        _rate_limiter.acquire(channel, len(recipients) if transport.per_recipient else 1)
+        sent = transport.send_batch(recipients, subject, message)
+        logger.info("Delivered %s notification batch to %s recipients", channel, len(recipients))
+        return sent
+
+    @staticmethod
+    def release(channel: str, recipients: List[Recipient], message: str) -> None:
+        """Release the dedup claims of a batch that will not be delivered."""
+        try:
+            _recent_notifications().release(channel, recipients, message)
+        except Exception as e:
+            logger.error("Failed to release %s notification claims: %s", channel, e)
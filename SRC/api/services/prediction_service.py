@@ -1,11 +1,19 @@
 """
 Prediction service for ML models.
 """
-from typing import Optional
+import asyncio
+import random
+import time
+from typing import List, Optional, Tuple
 
 from src.api.core.logging import get_logger
+from src.api.core.metrics import timed, timer
+from src.api.core.settings import settings
+from src.api.ml.inference_client import get_inference_client
 from src.api.ml.model_loader import ModelLoader
 from src.api.ml.features import FeatureExtractor
+from src.api.ml.prediction_cache import MISSING, prediction_cache
+from src.api.ml.shadow import get_shadow_evaluator
 
 logger = get_logger(__name__)
 
@@ -14,11 +22,34 @@ class PredictionService:
     """Service for making predictions using ML models."""
 
     @staticmethod
+    def _mirror_to_shadow(features: List[float], risk_score: float, seconds: Optional[float]) -> None:
+        """Hand the prediction to the shadow evaluator, if a candidate is configured; seconds is None on a cache hit."""
+        evaluator = get_shadow_evaluator()
+        if evaluator is not None and random.random() < settings.SHADOW_SAMPLE_RATE:
+            evaluator.submit(features, risk_score, seconds)
+
+    @staticmethod
+    @timed("service")
     def predict_risk(location: str, severity: str) -> float:
         """Predict risk score for an accident."""
-        logger.info(f"Predicting risk for location: {location}, severity: {severity}")
+        logger.debug("Predicting risk for location: %s, severity: %s", location, severity)
         
         try:
+            client = get_inference_client()
+            if client is not None:
+                features = FeatureExtractor.extract_risk_features(location, severity)
+                try:
+                    start = time.perf_counter()
+                    with timer("inference", "risk_remote"):
+                        risk_score = client.predict_sync("risk", features)
+                    if risk_score is None:
+                        return 0.5
+                    PredictionService._mirror_to_shadow(features, float(risk_score), time.perf_counter() - start)
+                    return float(risk_score)
+                except RuntimeError:
+                    # Called on the event loop thread; predict in-process below.
+                    pass
+
             # Load the model
             model = ModelLoader.load_risk_model()
             if model is None:
@@ -28,16 +59,73 @@ class PredictionService:
             # Extract features
             features = FeatureExtractor.extract_risk_features(location, severity)
             
-            # Make prediction
-            risk_score = model.predict([features])[0]
+            # Make prediction, reusing the result for repeated feature vectors
+            # and mirroring every request, hit or miss, so the shadow sees real traffic;
+            # only model calls are timed
+            version = ModelLoader.model_version("risk")
+            seconds = None
+            risk_score = prediction_cache.get("risk", version, features)
+            if risk_score is MISSING:
+                start = time.perf_counter()
+                with timer("inference", "risk"):
+                    risk_score = float(model.predict([features])[0])
+                seconds = time.perf_counter() - start
+                prediction_cache.put("risk", version, features, risk_score)
+            PredictionService._mirror_to_shadow(features, risk_score, seconds)
             
-            logger.info(f"Risk prediction completed: {risk_score}")
+            logger.debug("Risk prediction completed: %s", risk_score)
+            return risk_score
+        except Exception as e:
+            logger.error("Error during risk prediction: %s", e)
+            return 0.5
+
+    @staticmethod
+    @timed("service")
+    def predict_risk_batch(rows: List[Tuple[str, str]]) -> Optional[List[float]]:
+        """
+        Predict risk scores for many (location, severity) pairs in process.
+
+        Each distinct feature vector is predicted once, in a single model call.
+        Returns None when the risk model is not available, so bulk callers can
+        stop instead of writing default scores.
+        """
+        import numpy as np
+
+        model = ModelLoader.load_risk_model()
+        if model is None:
+            logger.warning("Risk model not loaded, skipping batch prediction")
+            return None
+        if not rows:
+            return []
+
+        features = np.asarray(FeatureExtractor.extract_risk_features_batch(rows), dtype=float)
+        unique, inverse = np.unique(features, axis=0, return_inverse=True)
+        with timer("inference", "risk_batch"):
+            scores = np.asarray(model.predict(unique), dtype=float)
+        return scores[inverse.reshape(-1)].tolist()
+
+    @staticmethod
+    async def predict_risk_async(location: str, severity: str) -> float:
+        """Predict risk score from async code without blocking the event loop."""
+        client = get_inference_client()
+        if client is None:
+            return await asyncio.to_thread(PredictionService.predict_risk, location, severity)
+
+        try:
+            features = FeatureExtractor.extract_risk_features(location, severity)
+            start = time.perf_counter()
+            with timer("inference", "risk_remote"):
+                risk_score = await client.predict("risk", features)
+            if risk_score is None:
+                return 0.5
+            PredictionService._mirror_to_shadow(features, float(risk_score), time.perf_counter() - start)
             return float(risk_score)
         except Exception as e:
-            logger.error(f"Error during risk prediction: {str(e)}")
+            logger.error("Error during risk prediction: %s", e)
             return 0.5
 
     @staticmethod
+    @timed("service")
     def predict_trend(historical_data: list) -> Optional[dict]:
         """Predict future trends based on historical data."""
         logger.info("Predicting trends from historical data")
@@ -51,5 +139,5 @@ class PredictionService:
             # This would depend on the actual implementation
             return {"trend": "up", "confidence": 0.75}
         except Exception as e:
-            logger.error(f"Error during trend prediction: {str(e)}")
+            logger.error("Error during trend prediction: %s", e)
             return None
@@ -0,0 +1,127 @@
+"""
+Re-scoring of stored accidents after the risk model changes.
+
+A job is keyed by the risk model version. plan() splits the accident id
+space into chunks of RESCORE_CHUNK_SIZE ids, recorded in risk_rescore_chunks,
+and each chunk is re-scored independently (in parallel, one Celery task
+each). A chunk is processed in batches of RESCORE_BATCH_SIZE rows: read the
+batch by keyset, predict it in one call, write only the changed scores in one
+statement, and advance the chunk's cursor in the same transaction, so an
+interrupted chunk resumes after its last committed batch.
+
+Between batches a chunk sleeps to stay under RESCORE_MAX_ROWS_PER_S and to
+idle at least RESCORE_PAUSE_RATIO times as long as the batch took, which
+backs off automatically when the primary slows down.
+
+Accidents created after plan() are scored at creation and not included.
+"""
+import time
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.api.core.logging import get_logger
+from src.api.core.metrics import timed
+from src.api.core.settings import settings
+from src.api.ml.model_loader import ModelLoader
+from src.api.repositories.accident_repository import AccidentRepository
+from src.api.repositories.rescore_repository import RescoreRepository
+from src.api.services.prediction_service import PredictionService
+
+logger = get_logger(__name__)
+
+
+def _current_model_version() -> Optional[str]:
+    """Version of the risk model file on disk, loaded if this worker holds another one."""
+    version = ModelLoader.file_version("risk")
+    if version is not None and ModelLoader.model_version("risk") != version:
+        ModelLoader.reload_risk_model()
+    return ModelLoader.model_version("risk") if version is not None else None
+
+
+class RescoringService:
+    """Service for re-scoring stored accidents with the current risk model."""
+
+    @staticmethod
+    def current_version() -> Optional[str]:
+        """Version of the risk model on disk, reloading it if it changed; None if there is none."""
+        return _current_model_version()
+
+    @staticmethod
+    @timed("service")
+    def plan(db: Session, version: str, chunk_size: Optional[int] = None) -> List[int]:
+        """Create the chunks of the job for version, once, and return the start ids of unfinished ones."""
+        progress = RescoreRepository(db)
+        chunks = progress.get_chunks(version)
+        if not chunks:
+            low, high = AccidentRepository(db).get_id_bounds()
+            if low is None:
+                return []
+            size = chunk_size or settings.RESCORE_CHUNK_SIZE
+            progress.add_chunks(version, [(start, min(start + size, high + 1)) for start in range(low, high + 1, size)])
+            db.commit()
+            chunks = progress.get_chunks(version)
+            logger.info("Planned re-scoring of ids %s-%s in %s chunks for model %s", low, high, len(chunks), version)
+        return [chunk.start_id for chunk in chunks if chunk.finished_at is None]
+
+    @staticmethod
+    @timed("service")
+    def rescore_chunk(db: Session, version: str, start_id: int, batch_size: Optional[int] = None) -> dict:
+        """Re-score one chunk from its cursor to its end; stops if a newer model has shipped."""
+        batch_size = batch_size or settings.RESCORE_BATCH_SIZE
+        accidents = AccidentRepository(db)
+        progress = RescoreRepository(db)
+        scanned = changed = 0
+
+        while True:
+            # Checked before every batch so a new model file stops this job
+            # instead of mixing its scores with those of the newer job.
+            if _current_model_version() != version:
+                logger.warning("Risk model changed from %s, stopping chunk %s", version, start_id)
+                return {"status": "superseded", "scanned": scanned, "changed": changed}
+            started = time.monotonic()
+            chunk = progress.lock_chunk(version, start_id)
+            if chunk is None or chunk.finished_at is not None:
+                db.rollback()
+                break
+            rows = accidents.get_scoring_rows(chunk.next_id, chunk.end_id, batch_size)
+            scores = PredictionService.predict_risk_batch([(row.location, row.severity) for row in rows])
+            if scores is None:
+                db.rollback()
+                raise RuntimeError("Risk model not available")
+
+            updates = [
+                (row.id, score) for row, score in zip(rows, scores)
+                if row.risk_score is None or abs(row.risk_score - score) > 1e-9
+            ]
+            accidents.update_risk_scores(updates)
+            finished = len(rows) < batch_size
+            next_id = chunk.end_id if finished else rows[-1].id + 1
+            progress.advance(version, start_id, next_id, len(rows), len(updates), finished)
+            db.commit()
+            scanned += len(rows)
+            changed += len(updates)
+            if finished:
+                break
+
+            elapsed = time.monotonic() - started
+            pause = elapsed * settings.RESCORE_PAUSE_RATIO
+            if settings.RESCORE_MAX_ROWS_PER_S:
+                pause = max(pause, len(rows) / settings.RESCORE_MAX_ROWS_PER_S - elapsed)
+            time.sleep(pause)
+
+        logger.info("Re-scored chunk %s for model %s: %s rows read, %s changed", start_id, version, scanned, changed)
+        return {"status": "success", "scanned": scanned, "changed": changed}
+
+    @staticmethod
+    @timed("service")
+    def progress(db: Session, version: str) -> dict:
+        """Totals for the job of a model version."""
+        chunks = RescoreRepository(db).get_chunks(version)
+        return {
+            "version": version,
+            "chunks": len(chunks),
+            "finished": sum(chunk.finished_at is not None for chunk in chunks),
+            "scanned": sum(chunk.scanned for chunk in chunks),
+            "changed": sum(chunk.changed for chunk in chunks),
+        }
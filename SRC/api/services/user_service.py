@@ -3,12 +3,18 @@ User business logic service.
 """
 from typing import Optional
 
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
+from src.api.core.admission import admission
 from src.api.core.logging import get_logger
+from src.api.core.metrics import timed, timer
+from src.api.core.rate_limit import check_rate_limit
 from src.api.core.security import get_password_hash, verify_password
+from src.api.core.serialization import rows_to_json
 from src.api.models.user import User
-from src.api.schemas.user_schema import UserCreate, UserUpdate
+from src.api.repositories.user_repository import UserRepository
+from src.api.schemas.user_schema import UserCreate, UserResponseList, UserUpdate
 
 logger = get_logger(__name__)
 
@@ -17,87 +23,111 @@ class UserService:
     """Service for user-related business logic."""
 
     @staticmethod
+    @timed("service")
     def create_user(db: Session, user_data: UserCreate) -> User:
         """Create a new user."""
-        logger.info(f"Creating user: {user_data.username}")
+        logger.info("Creating user: %s", user_data.username)
         
-        db_user = User(
+        stmt = insert(User).values(
             username=user_data.username,
             email=user_data.email,
             full_name=user_data.full_name,
             hashed_password=get_password_hash(user_data.password),
             is_active=user_data.is_active,
-        )
-        db.add(db_user)
+        ).returning(User)
+        db_user = db.scalars(stmt).one()
         db.commit()
-        db.refresh(db_user)
         
-        logger.info(f"User created successfully: {db_user.id}")
+        logger.info("User created successfully: %s", db_user.id)
         return db_user
 
     @staticmethod
+    @timed("service")
     def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-        """Authenticate a user by username and password."""
-        logger.info(f"Authenticating user: {username}")
+        """
+        Authenticate a user by username and password.
+
+        Raises RateLimitExceeded or Overloaded before hashing when the caller
+        or the server is over its limits.
+        """
+        logger.info("Authenticating user: %s", username)
         
-        user = db.query(User).filter(User.username == username).first()
-        if not user or not verify_password(password, user.hashed_password):
-            logger.warning(f"Authentication failed for user: {username}")
-            return None
+        # The username is only claimed here, so its bucket is per client IP;
+        # otherwise failed guesses from anywhere would lock the real user out.
+        check_rate_limit("login", username, user_per_address=True)
+        with admission("login"):
+            user = db.query(User).filter(User.username == username).first()
+            if not user or not verify_password(password, user.hashed_password):
+                logger.warning("Authentication failed for user: %s", username)
+                return None
         
-        logger.info(f"User authenticated successfully: {username}")
+        logger.info("User authenticated successfully: %s", username)
         return user
 
     @staticmethod
+    @timed("service")
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         """Get a user by ID."""
         return db.query(User).filter(User.id == user_id).first()
 
     @staticmethod
+    @timed("service")
     def get_user_by_username(db: Session, username: str) -> Optional[User]:
         """Get a user by username."""
         return db.query(User).filter(User.username == username).first()
 
     @staticmethod
+    @timed("service")
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
         """Get a user by email."""
         return db.query(User).filter(User.email == email).first()
 
     @staticmethod
+    @timed("service")
+    def get_all_users_json(db: Session, skip: int = 0, limit: int = 100, validate: bool = True) -> bytes:
+        """Get a page of users as JSON bytes, optionally without pydantic validation."""
+        rows = UserRepository(db).get_page_rows(skip, limit)
+        with timer("serialization", "users"):
+            if not validate:
+                return rows_to_json(rows)
+            return UserResponseList.dump_json(UserResponseList.validate_python(rows, from_attributes=True))
+
+    @staticmethod
+    @timed("service")
     def update_user(db: Session, user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update a user."""
-        logger.info(f"Updating user: {user_id}")
-        
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            logger.warning(f"User not found: {user_id}")
-            return None
+        logger.info("Updating user: %s", user_id)
         
         update_data = user_data.dict(exclude_unset=True)
         if "password" in update_data:
             update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
         
-        for key, value in update_data.items():
-            setattr(user, key, value)
+        if update_data:
+            stmt = update(User).where(User.id == user_id).values(**update_data).returning(User)
+            user = db.scalars(stmt).first()
+        else:
+            user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            logger.warning("User not found: %s", user_id)
+            return None
         
         db.commit()
-        db.refresh(user)
         
-        logger.info(f"User updated successfully: {user_id}")
+        logger.info("User updated successfully: %s", user_id)
         return user
 
     @staticmethod
+    @timed("service")
     def delete_user(db: Session, user_id: int) -> bool:
         """Delete a user."""
-        logger.info(f"Deleting user: {user_id}")
+        logger.info("Deleting user: %s", user_id)
         
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            logger.warning(f"User not found: {user_id}")
+        stmt = delete(User).where(User.id == user_id).returning(User.id)
+        if db.execute(stmt).first() is None:
+            logger.warning("User not found: %s", user_id)
             return False
         
-        db.delete(user)
         db.commit()
         
-        logger.info(f"User deleted successfully: {user_id}")
+        logger.info("User deleted successfully: %s", user_id)
         return True
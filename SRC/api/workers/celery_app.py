@@ -1,10 +1,16 @@
 """
 Celery application configuration for async tasks.
 """
+import sys
+
 from celery import Celery
+from celery.signals import after_setup_logger, worker_init, worker_process_shutdown
+from kombu import Queue
 
+from src.api.core.admission import admission
+from src.api.core.rate_limit import check_rate_limit
 from src.api.core.settings import settings
-from src.api.core.logging import get_logger
+from src.api.core.logging import get_logger, setup_logging
 
 logger = get_logger(__name__)
 
@@ -13,8 +19,114 @@ celery_app = Celery(
     "nodalcms",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    # Registers the tasks when a worker or beat starts from this module.
+    include=["src.api.workers.tasks"],
+)
+
+# Latency-sensitive work gets its own queues so long ML training and report
+# jobs can never occupy the worker slots it needs; see WORKER_PROFILES.
+QUEUE_CRITICAL = "critical"
+QUEUE_NOTIFICATIONS = "notifications"
+QUEUE_ML = "ml"
+QUEUE_REPORTS = "reports"
+QUEUE_DEFAULT = "default"
+
+# Priorities within a queue, 0-9. With the Redis broker lower numbers are
+# served first.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+TASK_QUEUES = tuple(
+    Queue(name, routing_key=name, queue_arguments={"x-max-priority": 10})
+    for name in (QUEUE_CRITICAL, QUEUE_NOTIFICATIONS, QUEUE_ML, QUEUE_REPORTS, QUEUE_DEFAULT)
 )
 
+TASK_ROUTES = {
+    "src.api.workers.tasks.process_accident_report": {"queue": QUEUE_CRITICAL, "priority": PRIORITY_HIGH},
+    "src.api.workers.tasks.send_notification": {"queue": QUEUE_NOTIFICATIONS, "priority": PRIORITY_HIGH},
+    "src.api.workers.tasks.fan_out_notification": {"queue": QUEUE_NOTIFICATIONS, "priority": PRIORITY_NORMAL},
+    "src.api.workers.tasks.deliver_notification_batch": {"queue": QUEUE_NOTIFICATIONS, "priority": PRIORITY_NORMAL},
+    "src.api.workers.tasks.train_model_task": {"queue": QUEUE_ML, "priority": PRIORITY_LOW},
+    "src.api.workers.tasks.generate_report": {"queue": QUEUE_REPORTS, "priority": PRIORITY_LOW},
+    "src.api.workers.tasks.rescore_risk_scores": {"queue": QUEUE_ML, "priority": PRIORITY_LOW},
+    "src.api.workers.tasks.rescore_risk_chunk": {"queue": QUEUE_ML, "priority": PRIORITY_LOW},
+    "src.api.workers.tasks.maintain_accident_partitions": {"queue": QUEUE_DEFAULT, "priority": PRIORITY_LOW},
+    "src.api.workers.tasks.relay_outbox_events": {"queue": QUEUE_NOTIFICATIONS, "priority": PRIORITY_NORMAL},
+    "src.api.workers.tasks.purge_outbox_events": {"queue": QUEUE_DEFAULT, "priority": PRIORITY_LOW},
+}
+
+# Run with: celery -A src.api.workers.celery_app beat
+BEAT_SCHEDULE = {
+    "maintain-accident-partitions": {
+        "task": "src.api.workers.tasks.maintain_accident_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+    "relay-outbox-events": {
+        "task": "src.api.workers.tasks.relay_outbox_events",
+        "schedule": settings.OUTBOX_RELAY_INTERVAL_S,
+        # A relay that waited longer than the interval is superseded by the next one.
+        "options": {"expires": settings.OUTBOX_RELAY_INTERVAL_S},
+    },
+    "purge-outbox-events": {
+        "task": "src.api.workers.tasks.purge_outbox_events",
+        "schedule": 60 * 60,
+    },
+}
+
+# One worker deployment per profile:
+#   python -m src.api.workers.celery_app realtime
+# Short tasks prefetch a few messages per process; long ones take one at a
+# time (-O fair) so a queued job is not stuck behind a busy process.
+WORKER_PROFILES = {
+    "realtime": {
+        "queues": [QUEUE_CRITICAL, QUEUE_NOTIFICATIONS],
+        "concurrency": 8,
+        "prefetch_multiplier": 4,
+    },
+    "ml": {
+        "queues": [QUEUE_ML],
+        "concurrency": 1,
+        "prefetch_multiplier": 1,
+        "max_tasks_per_child": 10,
+    },
+    "batch": {
+        "queues": [QUEUE_REPORTS, QUEUE_DEFAULT],
+        "concurrency": 2,
+        "prefetch_multiplier": 1,
+    },
+}
+
+
+def worker_args(profile: str) -> list:
+    """Command line arguments for `celery worker` under the given profile."""
+    config = WORKER_PROFILES[profile]
+    args = [
+        "-Q", ",".join(config["queues"]),
+        "--concurrency", str(config["concurrency"]),
+        "--prefetch-multiplier", str(config["prefetch_multiplier"]),
+        "-n", f"{profile}@%h",
+    ]
+    if config["prefetch_multiplier"] == 1:
+        args += ["-O", "fair"]
+    if "max_tasks_per_child" in config:
+        args += ["--max-tasks-per-child", str(config["max_tasks_per_child"])]
+    return args
+
+
+def enqueue(task, *args, user=None, **kwargs):
+    """
+    Send a task from the API under admission control.
+
+    The task's short name is looked up in RATE_LIMITS for a per-user and
+    per-IP limit, and publishing shares the "enqueue" concurrency limit, so a
+    slow broker sheds callers with Overloaded instead of piling up threads.
+    """
+    check_rate_limit(task.name.rsplit(".", 1)[-1], user)
+    with admission("enqueue"):
+        return task.apply_async(args, kwargs)
+
+
 # Configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -27,6 +139,46 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25 minutes
     worker_prefetch_multiplier=1,
     broker_connection_retry_on_startup=True,
+    task_queues=TASK_QUEUES,
+    task_default_queue=QUEUE_DEFAULT,
+    task_routes=TASK_ROUTES,
+    task_queue_max_priority=10,
+    task_default_priority=PRIORITY_NORMAL,
+    broker_transport_options={"priority_steps": list(range(10)), "queue_order_strategy": "priority"},
+    beat_schedule=BEAT_SCHEDULE,
+    result_expires=settings.CELERY_RESULT_EXPIRES,
+    task_compression=settings.CELERY_COMPRESSION,
+    result_compression=settings.CELERY_COMPRESSION,
 )
 
-logger.info("Celery app initialized")
+
+@after_setup_logger.connect
+def _configure_worker(**kwargs):
+    """Start logging and optional profiling once the worker process boots, not on import."""
+    setup_logging()
+    if settings.PROFILING_ENABLED:
+        from src.api.core.profiling import connect_celery_signals
+
+        connect_celery_signals()
+    logger.info("Celery app initialized")
+
+
+@worker_init.connect
+def _preload_models(**kwargs):
+    """Load models in the worker's main process so the prefork pool shares them."""
+    if settings.MODEL_PRELOAD:
+        from src.api.ml.model_loader import ModelLoader
+
+        ModelLoader.preload()
+
+
+@worker_process_shutdown.connect
+def _close_notification_transports(**kwargs):
+    """Close the SMTP/webhook connections each pool process keeps open between tasks."""
+    from src.api.core.notification_transports import close_transports
+
+    close_transports()
+
+
+if __name__ == "__main__":
+    celery_app.worker_main(["worker", *worker_args(sys.argv[1] if len(sys.argv) > 1 else "realtime")])
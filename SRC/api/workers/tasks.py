@@ -1,9 +1,14 @@
 """
 Celery tasks for async processing.
 """
+from typing import List, Optional
+
 from celery import shared_task
 
+from src.api.core.database import SessionLocal
 from src.api.core.logging import get_logger
+from src.api.core.settings import settings
+from src.api.services.notification_service import NotificationService
 
 logger = get_logger(__name__)
 
@@ -12,36 +17,82 @@ logger = get_logger(__name__)
 def process_accident_report(self, accident_id: int):
     """Process accident report asynchronously."""
     try:
-        logger.info(f"Processing accident report: {accident_id}")
+        logger.info("Processing accident report: %s", accident_id)
         
         # TODO: Implement accident processing logic
         # - Run ML predictions
         # - Send notifications
         # - Update database
         
-        logger.info(f"Accident report processed: {accident_id}")
+        logger.info("Accident report processed: %s", accident_id)
         return {"status": "success", "accident_id": accident_id}
     except Exception as exc:
-        logger.error(f"Error processing accident report: {str(exc)}")
+        logger.error("Error processing accident report: %s", exc)
         # Retry with exponential backoff
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
 
 @shared_task(bind=True, max_retries=3)
-def send_notification(self, user_id: int, message: str):
+def send_notification(self, user_id: int, message: str, channel: str = "email", subject: str = "NodalCMS alert"):
     """Send notification to user asynchronously."""
+    recipients = []
     try:
-        logger.info(f"Sending notification to user: {user_id}")
+        logger.info("Sending notification to user: %s", user_id)
         
-        # TODO: Implement notification sending logic
-        # - Email
-        # - SMS
-        # - Push notification
+        with SessionLocal() as db:
+            recipients = NotificationService.resolve_recipients(db, user_ids=[user_id])
+        # The first attempt claimed the recipient; a retry must not skip it as a duplicate.
+        for batch in NotificationService.plan_batches(channel, recipients, message, dedup=self.request.retries == 0):
+            NotificationService.deliver(channel, batch, subject, message)
         
-        logger.info(f"Notification sent to user: {user_id}")
+        logger.info("Notification sent to user: %s", user_id)
         return {"status": "success", "user_id": user_id}
     except Exception as exc:
-        logger.error(f"Error sending notification: {str(exc)}")
+        logger.error("Error sending notification: %s", exc)
+        if self.request.retries >= self.max_retries:
+            NotificationService.release(channel, recipients, message)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def fan_out_notification(self, message: str, user_ids: Optional[List[int]] = None,
+                         location: Optional[str] = None, channels: Optional[List[str]] = None,
+                         subject: str = "NodalCMS alert"):
+    """Notify many users: one recipient query, then one delivery task per channel batch."""
+    try:
+        with SessionLocal() as db:
+            recipients = NotificationService.resolve_recipients(db, user_ids=user_ids, location=location)
+        
+        batches = 0
+        for channel in channels or settings.NOTIFICATION_CHANNELS:
+            planned = list(NotificationService.plan_batches(channel, recipients, message))
+            for index, batch in enumerate(planned):
+                try:
+                    deliver_notification_batch.delay(channel, batch, subject, message)
+                except Exception:
+                    # Batches already enqueued stay claimed; the rest are planned again on retry.
+                    for pending in planned[index:]:
+                        NotificationService.release(channel, pending, message)
+                    raise
+                batches += 1
+        
+        logger.info("Fanned out notification to %s recipients in %s batches", len(recipients), batches)
+        return {"status": "success", "recipients": len(recipients), "batches": batches}
+    except Exception as exc:
+        logger.error("Error fanning out notification: %s", exc)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def deliver_notification_batch(self, channel: str, recipients: List[dict], subject: str, message: str):
+    """Deliver one batch of notifications on one channel."""
+    try:
+        sent = NotificationService.deliver(channel, recipients, subject, message)
+        return {"status": "success", "channel": channel, "sent": sent}
+    except Exception as exc:
+        logger.error("Error delivering %s notification batch: %s", channel, exc)
+        if self.request.retries >= self.max_retries:
+            NotificationService.release(channel, recipients, message)
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
 
@@ -49,7 +100,7 @@ def send_notification(self, user_id: int, message: str):
 def train_model_task(self, model_type: str, data_path: str):
     """Train ML model asynchronously."""
     try:
-        logger.info(f"Starting {model_type} model training with data from {data_path}")
+        logger.info("Starting %s model training with data from %s", model_type, data_path)
         
         # TODO: Implement model training logic
         # - Load data
@@ -57,10 +108,46 @@ def train_model_task(self, model_type: str, data_path: str):
         # - Train
         # - Save model
         
-        logger.info(f"{model_type} model training completed")
+        logger.info("%s model training completed", model_type)
         return {"status": "success", "model_type": model_type}
     except Exception as exc:
-        logger.error(f"Error during {model_type} model training: {str(exc)}")
+        logger.error("Error during %s model training: %s", model_type, exc)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def rescore_risk_scores(self, chunk_size: Optional[int] = None):
+    """Re-score stored accidents with the current risk model, one chunk task per id range."""
+    try:
+        from src.api.services.rescoring_service import RescoringService
+
+        version = RescoringService.current_version()
+        if version is None:
+            logger.warning("No risk model available; nothing to re-score")
+            return {"status": "skipped"}
+        with SessionLocal() as db:
+            chunks = RescoringService.plan(db, version, chunk_size)
+        for start_id in chunks:
+            rescore_risk_chunk.delay(version, start_id)
+        
+        logger.info("Dispatched %s re-scoring chunks for model %s", len(chunks), version)
+        return {"status": "success", "version": version, "chunks": len(chunks)}
+    except Exception as exc:
+        logger.error("Error planning risk re-scoring: %s", exc)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=5)
+def rescore_risk_chunk(self, version: str, start_id: int):
+    """Re-score one id range; a retry resumes after the last committed batch."""
+    try:
+        from src.api.services.rescoring_service import RescoringService
+
+        with SessionLocal() as db:
+            result = RescoringService.rescore_chunk(db, version, start_id)
+        return {"start_id": start_id, **result}
+    except Exception as exc:
+        logger.error("Error re-scoring chunk %s: %s", start_id, exc)
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
 
@@ -68,7 +155,7 @@ def train_model_task(self, model_type: str, data_path: str):
 def generate_report(self, report_type: str, filters: dict):
     """Generate reports asynchronously."""
     try:
-        logger.info(f"Generating {report_type} report")
+        logger.info("Generating %s report", report_type)
         
         # TODO: Implement report generation logic
         # - Query data
@@ -76,8 +163,57 @@ def generate_report(self, report_type: str, filters: dict):
         # - Generate file
         # - Upload
         
-        logger.info(f"{report_type} report generated successfully")
+        logger.info("%s report generated successfully", report_type)
         return {"status": "success", "report_type": report_type}
     except Exception as exc:
-        logger.error(f"Error generating {report_type} report: {str(exc)}")
+        logger.error("Error generating %s report: %s", report_type, exc)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def maintain_accident_partitions(self):
+    """Create upcoming accident partitions and archive cold ones."""
+    try:
+        from src.api.core.database import get_engine
+        from src.api.core.partitioning import maintain_partitions
+
+        result = maintain_partitions(get_engine())
+        logger.info("Accident partition maintenance done: %s", result)
+        return {"status": "success", **result}
+    except Exception as exc:
+        logger.error("Error maintaining accident partitions: %s", exc)
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def relay_outbox_events(self, max_batches: int = 20):
+    """Publish pending change events to the event stream."""
+    try:
+        from src.api.services.event_service import ChangeEventService
+
+        relayed = 0
+        with SessionLocal() as db:
+            for _ in range(max_batches):
+                count = ChangeEventService.relay(db)
+                relayed += count
+                if count < settings.OUTBOX_RELAY_BATCH_SIZE:
+                    break
+        return {"status": "success", "relayed": relayed}
+    except Exception as exc:
+        logger.error("Error relaying outbox events: %s", exc)
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@shared_task(bind=True, max_retries=3)
+def purge_outbox_events(self):
+    """Delete published change events older than the retention period."""
+    try:
+        from src.api.services.event_service import ChangeEventService
+
+        with SessionLocal() as db:
+            purged = ChangeEventService.purge_published(db)
+        logger.info("Purged %s published outbox events", purged)
+        return {"status": "success", "purged": purged}
+    except Exception as exc:
+        logger.error("Error purging outbox events: %s", exc)
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
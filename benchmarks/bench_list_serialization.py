@@ -0,0 +1,60 @@
+"""
+List endpoint throughput: ORM objects + per-model validation vs column rows + bulk/orjson.
+
+Run with: python -m benchmarks.bench_list_serialization [--iterations N] [--output FILE]
+"""
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.common import Results, benchmark_main, measure
+from src.api.models.accident import Accident
+from src.api.models.base import Base
+from src.api.models.user import User  # noqa: F401  (accidents.user_id references users)
+from src.api.schemas.accident_schema import AccidentResponse
+from src.api.services.accident_service import AccidentService
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def orm_page(db: Session, limit: int) -> bytes:
+    """The original path: hydrate ORM objects, validate each one, encode."""
+    accidents = db.query(Accident).offset(0).limit(limit).all()
+    payload = [AccidentResponse.model_validate(a).model_dump(mode="json") for a in accidents]
+    return json.dumps(payload).encode()
+
+
+NAME = "list_serialization"
+DEFAULT_ITERATIONS = 200
+
+
+def run(iterations: int = DEFAULT_ITERATIONS) -> Results:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            Accident(location=f"zone-{i % 50}", severity="medium", latitude=4.6, longitude=-74.1, risk_score=0.5)
+            for i in range(max(PAGE_SIZES))
+        )
+        db.commit()
+
+    results = {}
+    with Session(engine) as db:
+        for size in PAGE_SIZES:
+            cases = {
+                "orm_validate": lambda: orm_page(db, size),
+                "rows_bulk_validate": lambda: AccidentService.get_all_accidents_json(db, 0, size),
+                "rows_trusted_orjson": lambda: AccidentService.get_all_accidents_json(db, 0, size, validate=False),
+            }
+            for name, case in cases.items():
+                timing = measure(case, iterations=iterations, warmup=10)
+                # Each process-local call matches one list request minus HTTP overhead.
+                timing["requests_per_second"] = 1e6 / timing["wall_us_per_call"]
+                results[f"page_{size}/{name}"] = timing
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_main(NAME, run, __doc__, DEFAULT_ITERATIONS)
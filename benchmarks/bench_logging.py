@@ -0,0 +1,67 @@
+"""
+Per-request logging overhead: disabled vs synchronous file handler vs queued pipeline.
+
+Run with: python -m benchmarks.bench_logging [--iterations N] [--output FILE]
+"""
+import logging
+import logging.handlers
+import queue
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import Results, benchmark_main, measure
+from src.api.core.logging import JsonFormatter, NonBlockingQueueHandler
+from src.api.ml.features import FeatureExtractor
+
+
+def simulated_request(log: logging.Logger) -> None:
+    """Roughly the logging done by AccidentService.create_accident."""
+    log.info("Creating accident at location: %s", "highway")
+    features = FeatureExtractor.extract_risk_features("highway", "critical")
+    log.debug("Extracted risk features: %s", features)
+    log.info("Accident created successfully: %s (Risk Score: %s)", 42, 0.87)
+
+
+NAME = "logging_overhead"
+DEFAULT_ITERATIONS = 20000
+
+
+def run(iterations: int = DEFAULT_ITERATIONS) -> Results:
+    log = logging.getLogger("nodalcms.bench")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # No handlers and every level disabled.
+        logging.disable(logging.CRITICAL)
+        results["disabled"] = measure(lambda: simulated_request(log), iterations=iterations)
+        logging.disable(logging.NOTSET)
+
+        # The previous setup: formatting and file I/O on the calling thread.
+        sync_handler = logging.handlers.RotatingFileHandler(Path(tmp) / "sync.log", maxBytes=10485760, backupCount=1)
+        sync_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        log.addHandler(sync_handler)
+        results["sync_file_handler"] = measure(lambda: simulated_request(log), iterations=iterations)
+        log.removeHandler(sync_handler)
+        sync_handler.close()
+
+        # Queue handler on the calling thread, JSON file output on the listener.
+        log_queue: queue.Queue = queue.Queue(maxsize=100000)
+        file_handler = logging.handlers.RotatingFileHandler(Path(tmp) / "queued.log", maxBytes=10485760, backupCount=1)
+        file_handler.setFormatter(JsonFormatter())
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        log.addHandler(queue_handler)
+        listener.start()
+        results["queued_json"] = measure(lambda: simulated_request(log), iterations=iterations)
+        listener.stop()
+        log.removeHandler(queue_handler)
+        file_handler.close()
+        results["queued_json"]["dropped_records"] = queue_handler.dropped
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_main(NAME, run, __doc__, DEFAULT_ITERATIONS)
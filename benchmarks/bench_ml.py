@@ -0,0 +1,54 @@
+"""
+Feature extraction, batch inference and token verification microbenchmarks.
+
+Run with: python -m benchmarks.bench_ml [--iterations N] [--output FILE]
+"""
+import itertools
+
+from benchmarks.common import Results, benchmark_main, measure
+from benchmarks.synthetic import generate_accidents
+from src.api.core.security import create_access_token, verify_token
+from src.api.ml.features import FeatureExtractor
+from src.api.ml.predict import Predictor
+
+NAME = "ml"
+DEFAULT_ITERATIONS = 2000
+BATCH_SIZES = (1, 100, 1000)
+
+
+def train_risk_model(samples: int = 5000):
+    """Fit a small model on synthetic accidents so batch_predict has something to run."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    features, labels = [], []
+    for row in generate_accidents(samples, user_count=100):
+        location, severity = row[1], row[4]
+        features.append(FeatureExtractor.extract_risk_features(location, severity))
+        labels.append(int(row[7] > 0.5))
+    return RandomForestClassifier(n_estimators=100, random_state=42).fit(features, labels), features
+
+
+def run(iterations: int = DEFAULT_ITERATIONS) -> Results:
+    results = {}
+
+    inputs = itertools.cycle([(row[1], row[4]) for row in generate_accidents(1000, user_count=100)])
+    results["feature_extractor.extract_risk_features"] = measure(
+        lambda: FeatureExtractor.extract_risk_features(*next(inputs)), iterations=iterations * 10
+    )
+
+    model, features = train_risk_model()
+    predictor = Predictor()
+    predictor.risk_model = model
+    for size in BATCH_SIZES:
+        batch = features[:size]
+        timing = measure(lambda: predictor.batch_predict(batch), iterations=max(10, iterations // size), warmup=5)
+        timing["rows_per_second"] = size / timing["wall_us_per_call"] * 1e6
+        results[f"predictor.batch_predict/{size}"] = timing
+
+    token = create_access_token({"sub": "user42"})
+    results["security.verify_token"] = measure(lambda: verify_token(token), iterations=iterations)
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_main(NAME, run, __doc__, DEFAULT_ITERATIONS)
@@ -0,0 +1,61 @@
+"""
+Per-call CPU cost of the repository hot queries: legacy Query API vs cached select().
+
+Run with: python -m benchmarks.bench_repository_queries [--iterations N] [--output FILE]
+
+Uses in-memory SQLite unless BENCH_DATABASE_URL points at a database already
+loaded with benchmarks.synthetic.
+"""
+from sqlalchemy.orm import Session
+
+from benchmarks.common import Results, bench_engine, benchmark_main, measure
+from src.api.models.accident import Accident
+from src.api.models.base import Base
+from src.api.models.user import User
+from src.api.repositories.accident_repository import AccidentRepository
+from src.api.repositories.user_repository import UserRepository
+
+
+def seed(db: Session, users: int = 100, accidents: int = 1000) -> None:
+    """Insert a small deterministic data set."""
+    severities = ["low", "medium", "high", "critical"]
+    db.add_all(
+        User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x")
+        for i in range(users)
+    )
+    db.add_all(
+        Accident(location="urban", severity=severities[i % 4], user_id=i % users + 1)
+        for i in range(accidents)
+    )
+    db.commit()
+
+
+NAME = "repository_queries"
+DEFAULT_ITERATIONS = 5000
+
+
+def run(iterations: int = DEFAULT_ITERATIONS) -> Results:
+    engine = bench_engine()
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db)
+
+    with Session(engine) as db:
+        users = UserRepository(db)
+        accidents = AccidentRepository(db)
+        cases = {
+            "user.get_by_id/query_api": lambda: db.query(User).filter(User.id == 42).first(),
+            "user.get_by_id/cached_select": lambda: users.get_by_id(42),
+            "user.get_by_username/query_api": lambda: db.query(User).filter(User.username == "user42").first(),
+            "user.get_by_username/cached_select": lambda: users.get_by_username("user42"),
+            "accident.get_by_id/query_api": lambda: db.query(Accident).filter(Accident.id == 42).first(),
+            "accident.get_by_id/cached_select": lambda: accidents.get_by_id(42),
+            "accident.count_by_severity/query_api": lambda: db.query(Accident).filter(Accident.severity == "high").count(),
+            "accident.count_by_severity/cached_select": lambda: accidents.count_by_severity("high"),
+        }
+        return {name: measure(case, iterations=iterations) for name, case in cases.items()}
+
+
+if __name__ == "__main__":
+    benchmark_main(NAME, run, __doc__, DEFAULT_ITERATIONS)
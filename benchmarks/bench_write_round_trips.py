@@ -0,0 +1,118 @@
+"""
+Database round trips per write: legacy load/commit/refresh vs RETURNING-based writes.
+
+Run with: python -m benchmarks.bench_write_round_trips [--iterations N] [--output FILE]
+"""
+import itertools
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from benchmarks.common import Results, benchmark_main
+from src.api.models.accident import Accident
+from src.api.models.base import Base
+from src.api.models.user import User  # noqa: F401  (accidents.user_id references users)
+from src.api.repositories.accident_repository import AccidentRepository
+from src.api.schemas.accident_schema import AccidentCreate, AccidentUpdate
+
+
+class StatementCounter:
+    """Count statements sent to the database through an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def legacy_create(db: Session, data: AccidentCreate) -> Accident:
+    accident = Accident(**data.dict())
+    db.add(accident)
+    db.commit()
+    db.refresh(accident)
+    return accident
+
+
+def legacy_update(db: Session, accident_id: int, data: AccidentUpdate) -> Accident:
+    accident = db.query(Accident).filter(Accident.id == accident_id).first()
+    for key, value in data.dict(exclude_unset=True).items():
+        setattr(accident, key, value)
+    db.commit()
+    db.refresh(accident)
+    return accident
+
+
+def legacy_delete(db: Session, accident_id: int) -> bool:
+    accident = db.query(Accident).filter(Accident.id == accident_id).first()
+    db.delete(accident)
+    db.commit()
+    return True
+
+
+def operations(db: Session, variant: str, payload: AccidentCreate, change: AccidentUpdate):
+    """Create, update and delete callables for one variant."""
+    repository = AccidentRepository(db)
+
+    def create() -> Accident:
+        if variant == "legacy":
+            return legacy_create(db, payload)
+        return repository.create(payload)
+
+    def update(accident_id: int) -> Accident:
+        if variant == "legacy":
+            return legacy_update(db, accident_id, change)
+        return repository.update(accident_id, change)
+
+    def delete(accident_id: int) -> bool:
+        if variant == "legacy":
+            return legacy_delete(db, accident_id)
+        return repository.delete(accident_id)
+
+    return create, update, delete
+
+
+def timed_run(name, counter, operation, iterations, results):
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    elapsed = time.perf_counter() - start
+    results[name] = {
+        "iterations": iterations,
+        "round_trips_per_op": counter.count / iterations,
+        "wall_us_per_op": elapsed / iterations * 1e6,
+    }
+
+
+NAME = "write_round_trips"
+DEFAULT_ITERATIONS = 1000
+
+
+def run(iterations: int = DEFAULT_ITERATIONS) -> Results:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    counter = StatementCounter(engine)
+    payload = AccidentCreate(location="highway", severity="high")
+    change = AccidentUpdate(status="closed")
+    results = {}
+
+    for variant in ("legacy", "returning"):
+        # Sessions handed out by SessionLocal keep rows loaded across commit.
+        with Session(engine, expire_on_commit=False) as db:
+            create, update, delete = operations(db, variant, payload, change)
+
+            ids = []
+            timed_run(f"create/{variant}", counter, lambda: ids.append(create().id), iterations, results)
+            update_ids = itertools.cycle(ids)
+            timed_run(f"update/{variant}", counter, lambda: update(next(update_ids)), iterations, results)
+            delete_ids = iter(ids)
+            timed_run(f"delete/{variant}", counter, lambda: delete(next(delete_ids)), iterations, results)
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_main(NAME, run, __doc__, DEFAULT_ITERATIONS)
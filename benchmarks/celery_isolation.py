@@ -0,0 +1,120 @@
+"""
+Queue wait of short Celery tasks while long ones are running.
+
+Run with: python -m benchmarks.celery_isolation [--broker memory://] [--iterations 200]
+
+A burst of long "train_model_task" jobs is enqueued, then short
+"process_accident_report" tasks arrive at a steady rate. Both run as sleeps
+on embedded thread-pool workers, registered under the production task names.
+In "shared" mode every task goes to one queue consumed by one worker; in
+"routed" mode the production TASK_QUEUES/TASK_ROUTES apply and the same
+number of slots is split between a realtime worker and an ML worker. The
+reported wait is the time from enqueue to the short task starting.
+"""
+import argparse
+import threading
+import time
+from typing import Dict, List
+
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+
+from benchmarks.common import Results, percentile, report
+from src.api.workers.celery_app import QUEUE_CRITICAL, QUEUE_ML, QUEUE_NOTIFICATIONS, TASK_QUEUES, TASK_ROUTES
+
+NAME = "celery_isolation"
+DEFAULT_ITERATIONS = 200
+
+SLOTS = 4
+LONG_TASKS = 16
+LONG_TASK_SECONDS = 0.5
+ARRIVAL_INTERVAL = 0.01
+
+
+def _make_app(broker: str, routed: bool):
+    app = Celery("bench", broker=broker, set_as_current=False)
+    app.conf.update(
+        task_ignore_result=True,
+        # The memory transport's worker loop only refreshes the prefetch limit
+        # every 2 s, which would stall a saturated worker; let it prefetch
+        # freely so waiting happens in a plain FIFO instead.
+        worker_prefetch_multiplier=0 if broker.startswith("memory") else 1,
+        broker_transport_options={"polling_interval": 0.005},
+        task_queues=TASK_QUEUES if routed else None,
+        task_routes=TASK_ROUTES if routed else None,
+        task_default_queue="default",
+    )
+    waits: List[float] = []
+    finished = threading.Semaphore(0)
+
+    @app.task(name="src.api.workers.tasks.process_accident_report")
+    def short_task(sent_at: float) -> None:
+        waits.append(time.time() - sent_at)
+        finished.release()
+
+    @app.task(name="src.api.workers.tasks.train_model_task")
+    def long_task(seconds: float) -> None:
+        time.sleep(seconds)
+        finished.release()
+
+    return app, short_task, long_task, waits, finished
+
+
+def run_mode(broker: str, routed: bool, short_tasks: int) -> Dict[str, float]:
+    app, short_task, long_task, waits, finished = _make_app(broker, routed)
+    if routed:
+        workers = [
+            {"queues": [QUEUE_CRITICAL, QUEUE_NOTIFICATIONS], "concurrency": SLOTS // 2},
+            {"queues": [QUEUE_ML], "concurrency": SLOTS - SLOTS // 2},
+        ]
+    else:
+        workers = [{"queues": ["default"], "concurrency": SLOTS}]
+
+    contexts = [
+        start_worker(app, pool="threads", perform_ping_check=False, shutdown_timeout=30, **w) for w in workers
+    ]
+    for context in contexts:
+        context.__enter__()
+    try:
+        start = time.perf_counter()
+        for _ in range(LONG_TASKS):
+            long_task.delay(LONG_TASK_SECONDS)
+        for _ in range(short_tasks):
+            short_task.delay(time.time())
+            time.sleep(ARRIVAL_INTERVAL)
+        for _ in range(LONG_TASKS + short_tasks):
+            finished.acquire()
+        elapsed = time.perf_counter() - start
+    finally:
+        for context in reversed(contexts):
+            context.__exit__(None, None, None)
+
+    waits_ms = [w * 1000 for w in waits]
+    return {
+        "short_tasks": len(waits_ms),
+        "wait_p50_ms": percentile(waits_ms, 0.50),
+        "wait_p95_ms": percentile(waits_ms, 0.95),
+        "wait_p99_ms": percentile(waits_ms, 0.99),
+        "wait_max_ms": max(waits_ms),
+        "total_s": elapsed,
+    }
+
+
+def run(iterations: int, broker: str = "memory://") -> Results:
+    return {
+        "shared": run_mode(broker, routed=False, short_tasks=iterations),
+        "routed": run_mode(broker, routed=True, short_tasks=iterations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="short tasks per mode")
+    parser.add_argument("--broker", default="memory://", help="e.g. redis://localhost:6379/15")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+    report(NAME, run(args.iterations, args.broker), args.output)
+
+
+if __name__ == "__main__":
+    main()
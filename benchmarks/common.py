@@ -0,0 +1,108 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark module defines NAME, DEFAULT_ITERATIONS and
+run(iterations) -> results, and calls benchmark_main() from its __main__ block.
+Results are written as JSON so runs from different commits can be compared
+with benchmarks.compare.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def measure(func: Callable[[], Any], iterations: int = 1000, warmup: int = 100) -> Dict[str, float]:
+    """Run func repeatedly and return per-call CPU and wall time in microseconds."""
+    for _ in range(warmup):
+        func()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    cpu_elapsed = time.process_time() - cpu_start
+    wall_elapsed = time.perf_counter() - wall_start
+
+    return {
+        "iterations": iterations,
+        "cpu_us_per_call": cpu_elapsed / iterations * 1e6,
+        "wall_us_per_call": wall_elapsed / iterations * 1e6,
+    }
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def bench_engine() -> Engine:
+    """Engine for database benchmarks: BENCH_DATABASE_URL if set, else in-memory SQLite."""
+    return create_engine(os.environ.get("BENCH_DATABASE_URL", "sqlite://"))
+
+
+def git_commit() -> Optional[str]:
+    """Current commit hash, if running inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata() -> Dict[str, Any]:
+    """Environment details stored alongside results."""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": os.environ.get("BENCH_DATABASE_URL", "sqlite://").split("@")[-1],
+    }
+
+
+def print_results(benchmark: str, results: Results) -> None:
+    """Print results as a table."""
+    print(f"\n{benchmark}")
+    for case, values in results.items():
+        formatted = ", ".join(
+            f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in values.items()
+        )
+        print(f"  {case:<40} {formatted}")
+
+
+def write_json(payload: Dict[str, Any], output: str) -> None:
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def report(benchmark: str, results: Results, output: Optional[str] = None) -> None:
+    """Print results and optionally write them to a JSON file."""
+    print_results(benchmark, results)
+    if output:
+        write_json({**metadata(), "benchmarks": {benchmark: results}}, output)
+
+
+def benchmark_main(name: str, run: Callable[[int], Results], description: str, default_iterations: int) -> None:
+    """Command line entry point shared by the benchmark modules."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--iterations", type=int, default=default_iterations)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+    report(name, run(args.iterations), args.output)
@@ -0,0 +1,56 @@
+"""
+Compare two benchmark result files, e.g. from two commits.
+
+Run with: python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Exits with status 1 if any metric regressed by more than the threshold
+(percent). Throughput metrics (*_per_second) are better when higher; every
+other timing or count is better when lower.
+"""
+import argparse
+import json
+import sys
+from typing import Iterator, Tuple
+
+IGNORED_METRICS = {"iterations", "requests", "errors"}
+
+
+def _metrics(payload: dict) -> Iterator[Tuple[str, str, str, float]]:
+    for benchmark, cases in payload.get("benchmarks", {}).items():
+        for case, values in cases.items():
+            for metric, value in values.items():
+                if metric not in IGNORED_METRICS and isinstance(value, (int, float)):
+                    yield benchmark, case, metric, float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    print(f"baseline {baseline.get('commit')}  current {current.get('commit')}")
+    previous = {key[:3]: key[3] for key in _metrics(baseline)}
+    regressions = 0
+    for benchmark, case, metric, value in _metrics(current):
+        old = previous.get((benchmark, case, metric))
+        if old is None or old == 0:
+            continue
+        change = (value - old) / old * 100
+        higher_is_better = metric.endswith("_per_second")
+        regressed = (-change if higher_is_better else change) > args.threshold
+        regressions += regressed
+        marker = "REGRESSION" if regressed else ""
+        print(f"{benchmark}/{case} {metric}: {old:.2f} -> {value:.2f} ({change:+.1f}%) {marker}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
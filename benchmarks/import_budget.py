@@ -0,0 +1,83 @@
+"""
+Import-time budget check for the API and worker entry points.
+
+Run with: python -m benchmarks.import_budget [--budget-ms 1500] [--output FILE]
+
+Each entry point is loaded in a fresh interpreter with -X importtime: the API
+module, and for the worker the Celery app plus the task modules it imports at
+boot. The check fails (exit status 1) if the cumulative import time exceeds
+the budget or if a module that must stay lazy (sklearn, pandas, ...) was
+imported.
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+from benchmarks.common import report
+
+NAME = "import_budget"
+
+ENTRY_POINTS = {
+    "api": "import src.api.main",
+    "worker": (
+        "from src.api.workers.celery_app import celery_app; "
+        "celery_app.loader.import_default_modules()"
+    ),
+}
+
+# Heavy or optional packages that must only load when actually used.
+FORBIDDEN_PREFIXES = ("sklearn", "scipy", "pandas", "tensorflow", "pyinstrument")
+
+
+def import_profile(code: str) -> Tuple[float, Dict[str, float]]:
+    """Run code in a fresh interpreter; return total import ms and per-module cumulative ms."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.strip()
+        modules[stripped] = int(cumulative_us) / 1000
+        # Top-level imports have no nesting indentation beyond the single space.
+        if name.startswith(" ") and not name.startswith("  "):
+            total_us += int(cumulative_us)
+    return total_us / 1000, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for label, code in ENTRY_POINTS.items():
+        total_ms, modules = import_profile(code)
+        forbidden = sorted(name for name in modules if name.split(".")[0] in FORBIDDEN_PREFIXES)
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+        results[label] = {
+            "import_ms": total_ms,
+            "modules": len(modules),
+            "forbidden_imports": len(forbidden),
+        }
+        print(f"{label}: slowest imports " + ", ".join(f"{name}={ms:.1f}ms" for name, ms in slowest))
+        if total_ms > args.budget_ms:
+            failures.append(f"{label} imports in {total_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+        if forbidden:
+            failures.append(f"{label} eagerly imports {', '.join(forbidden[:5])}")
+
+    report(NAME, results, args.output)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
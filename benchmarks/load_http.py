@@ -0,0 +1,81 @@
+"""
+HTTP load scenario against a running API.
+
+Start Postgres/Redis (docker-compose up -d db), load data with
+benchmarks.synthetic, run the API, then:
+
+    python -m benchmarks.load_http --base-url http://localhost:8000 \
+        --path /health --path /metrics --concurrency 32 --duration 30 --output load.json
+
+Each worker sends requests back to back for the given duration; latency
+percentiles and throughput are reported per path.
+"""
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import Results, percentile, report
+
+NAME = "http_load"
+
+
+async def _worker(client: httpx.AsyncClient, paths: List[str], deadline: float,
+                  latencies: Dict[str, list], errors: Dict[str, int], offset: int) -> None:
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[path] += 1
+        except httpx.HTTPError:
+            errors[path] += 1
+        latencies[path].append(time.perf_counter() - start)
+
+
+async def run_load(base_url: str, paths: List[str], concurrency: int, duration: float) -> Results:
+    """Drive the API with concurrency clients for duration seconds."""
+    latencies: Dict[str, list] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _worker(client, paths, deadline, latencies, errors, i) for i in range(concurrency)
+        ))
+
+    results = {}
+    for path in paths:
+        samples = latencies[path]
+        results[path] = {
+            "requests": len(samples),
+            "errors": errors[path],
+            "requests_per_second": len(samples) / duration,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="path to request; repeatable")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args.base_url, args.paths or ["/health"], args.concurrency, args.duration))
+    report(NAME, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Per-worker memory with and without preloading models before fork (Linux only).
+
+Run with: python -m benchmarks.prefork_memory [--workers 4] [--estimators 300] [--output FILE]
+
+A risk model is trained into a temporary MODEL_PATH. In "lazy" mode every
+forked worker unpickles its own copy, as uvicorn/Celery workers do on their
+first request; in "preload" mode the parent calls ModelLoader.preload() first.
+While all workers are alive each reports RSS, PSS (shared pages split between
+processes) and USS (pages private to the worker) from /proc/self/smaps_rollup.
+"""
+import argparse
+import multiprocessing
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.common import Results, report
+from benchmarks.synthetic import generate_accidents
+from src.api.core.settings import settings
+from src.api.ml.features import FeatureExtractor
+from src.api.ml.model_loader import ModelLoader
+from src.api.ml.predict import Predictor
+
+NAME = "prefork_memory"
+
+
+def memory_mb() -> Dict[str, float]:
+    """RSS, PSS and USS of the current process in MiB."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": values.get("Rss", 0.0),
+        "pss_mb": values.get("Pss", 0.0),
+        "uss_mb": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
+
+
+def _worker(barrier, results) -> None:
+    # Serve a "first request" the way a worker would.
+    Predictor().predict_risk(FeatureExtractor.extract_risk_features("highway", "high"))
+    barrier.wait()
+    results.put(memory_mb())
+    barrier.wait()
+
+
+def measure_mode(workers: int) -> Dict[str, float]:
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {key: sum(s[key] for s in samples) / workers for key in samples[0]}
+
+
+def run(workers: int, estimators: int) -> Results:
+    from sklearn.ensemble import RandomForestClassifier
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = list(generate_accidents(20000, user_count=100))
+        features = [FeatureExtractor.extract_risk_features(r[1], r[4]) + [r[2], r[3]] for r in rows]
+        labels = [int(r[7] > 0.5) for r in rows]
+        model = RandomForestClassifier(n_estimators=estimators, random_state=42).fit(features, labels)
+        with open(Path(tmp) / "risk_model.pkl", "wb") as f:
+            pickle.dump(model, f)
+        del model
+        settings.MODEL_PATH = tmp
+
+        # Warmup batches use the 2-column risk table; this model takes 4 columns.
+        FeatureExtractor._RISK_FEATURE_TABLE = {
+            key: value + [0.0, 0.0] for key, value in FeatureExtractor._RISK_FEATURE_TABLE.items()
+        }
+
+        ModelLoader.clear_cache()
+        lazy = measure_mode(workers)
+        ModelLoader.preload()
+        preload = measure_mode(workers)
+
+    savings = {f"{key}_saved_per_worker": lazy[key] - preload[key] for key in lazy}
+    return {"lazy": lazy, "preload": preload, "savings": savings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--estimators", type=int, default=300, help="trees in the synthetic model")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+    report(NAME, run(args.workers, args.estimators), args.output)
+
+
+if __name__ == "__main__":
+    main()
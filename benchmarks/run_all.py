@@ -0,0 +1,41 @@
+"""
+Run every microbenchmark and write one combined JSON file.
+
+Run with: python -m benchmarks.run_all --output results.json [--scale 0.1] [--only ml]
+"""
+import argparse
+import importlib
+
+from benchmarks.common import metadata, print_results, write_json
+
+MODULES = (
+    "benchmarks.bench_repository_queries",
+    "benchmarks.bench_write_round_trips",
+    "benchmarks.bench_list_serialization",
+    "benchmarks.bench_logging",
+    "benchmarks.bench_ml",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply each benchmark's iteration count")
+    parser.add_argument("--only", action="append", help="benchmark NAME to run; repeatable")
+    args = parser.parse_args()
+
+    payload = {**metadata(), "benchmarks": {}}
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        if args.only and module.NAME not in args.only:
+            continue
+        results = module.run(max(1, int(module.DEFAULT_ITERATIONS * args.scale)))
+        print_results(module.NAME, results)
+        payload["benchmarks"][module.NAME] = results
+
+    if args.output:
+        write_json(payload, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Seeded synthetic users and accidents for benchmarks and load tests.
+
+Run with:
+    python -m benchmarks.synthetic --database-url URL [--users N] [--accidents N] [--seed S]
+
+Rows are streamed to Postgres with COPY in batches, so millions of accidents
+can be loaded without holding them in memory. The same seed always produces
+the same data. Load into empty tables: accident user_id values assume the
+users were assigned ids 1..N.
+"""
+import argparse
+import csv
+import io
+import itertools
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from src.api.models.accident import Accident
+from src.api.models.base import Base
+from src.api.models.user import User
+
+SEVERITIES = ("low", "medium", "high", "critical")
+LOCATIONS = ("urban", "residential", "highway", "rural")
+LOCATION_WEIGHTS = (0.50, 0.25, 0.15, 0.10)
+
+# Severity mix per location type: highways and rural roads see worse crashes.
+SEVERITY_WEIGHTS = {
+    "urban": (0.50, 0.35, 0.12, 0.03),
+    "residential": (0.60, 0.30, 0.08, 0.02),
+    "highway": (0.20, 0.35, 0.28, 0.17),
+    "rural": (0.30, 0.35, 0.23, 0.12),
+}
+
+STATUSES = ("closed", "investigating", "open")
+STATUS_WEIGHTS = (0.70, 0.20, 0.10)
+
+# (latitude, longitude, spread in degrees, share of accidents)
+CLUSTERS = (
+    (4.711, -74.072, 0.08, 0.45),
+    (6.244, -75.581, 0.06, 0.25),
+    (3.451, -76.532, 0.05, 0.15),
+    (10.968, -74.781, 0.04, 0.10),
+    (7.119, -73.122, 0.04, 0.05),
+)
+
+# Morning and evening rush hours dominate.
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 8, 9, 6, 4, 4, 5, 5, 4, 5, 7, 9, 8, 5, 3, 2, 2, 1)
+
+USER_COLUMNS = (
+    "username", "email", "hashed_password", "full_name",
+    "is_active", "is_superuser", "created_at", "updated_at",
+)
+ACCIDENT_COLUMNS = (
+    "user_id", "location", "latitude", "longitude", "severity",
+    "description", "status", "risk_score", "created_at", "updated_at",
+)
+
+
+def generate_users(count: int, hashed_password: str, seed: int = 42, end: Optional[datetime] = None) -> Iterator[Tuple]:
+    """Yield user rows in USER_COLUMNS order; usernames are user1..userN."""
+    rng = random.Random(seed)
+    end = end or datetime(2024, 1, 1)
+    for i in range(1, count + 1):
+        created = end - timedelta(days=rng.uniform(30, 730))
+        yield (
+            f"user{i}",
+            f"user{i}@example.com",
+            hashed_password,
+            f"Synthetic User {i}",
+            rng.random() > 0.02,
+            i == 1,
+            created,
+            created,
+        )
+
+
+def generate_accidents(count: int, user_count: int, seed: int = 42, days: int = 365,
+                       end: Optional[datetime] = None) -> Iterator[Tuple]:
+    """Yield accident rows in ACCIDENT_COLUMNS order with skewed, clustered values."""
+    rng = random.Random(seed + 1)
+    end = end or datetime(2024, 1, 1)
+    cluster_weights = [c[3] for c in CLUSTERS]
+    severity_value = {s: i + 1 for i, s in enumerate(SEVERITIES)}
+
+    for _ in range(count):
+        location = rng.choices(LOCATIONS, LOCATION_WEIGHTS)[0]
+        severity = rng.choices(SEVERITIES, SEVERITY_WEIGHTS[location])[0]
+        lat, lon, spread, _share = rng.choices(CLUSTERS, cluster_weights)[0]
+        day = end - timedelta(days=rng.randrange(days))
+        hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+        created = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+        # A few heavy reporters file most accidents; some reports are anonymous.
+        user_id = int(user_count * rng.random() ** 3) + 1 if user_count and rng.random() > 0.1 else None
+        risk = min(1.0, max(0.0, severity_value[severity] / 4 + rng.gauss(0, 0.1)))
+        yield (
+            user_id,
+            location,
+            round(rng.gauss(lat, spread), 6),
+            round(rng.gauss(lon, spread), 6),
+            severity,
+            None,
+            rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+            round(risk, 4),
+            created,
+            created,
+        )
+
+
+def _batches(rows: Iterable[Tuple], size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def copy_rows(engine: Engine, table: str, columns: Sequence[str], rows: Iterable[Tuple], batch_size: int = 100000) -> int:
+    """Load rows with COPY on Postgres (psycopg2), or batched INSERTs elsewhere."""
+    total = 0
+    if engine.dialect.name != "postgresql":
+        model = {"users": User, "accidents": Accident}[table]
+        with engine.begin() as conn:
+            for batch in _batches(rows, batch_size):
+                conn.execute(insert(model), [dict(zip(columns, row)) for row in batch])
+                total += len(batch)
+        return total
+
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(["" if v is None else v for v in row] for row in batch)
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            total += len(batch)
+        raw.commit()
+    finally:
+        raw.close()
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"), required="BENCH_DATABASE_URL" not in os.environ)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--accidents", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch-size", type=int, default=100000)
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables first")
+    args = parser.parse_args()
+
+    from src.api.core.security import get_password_hash
+
+    engine = create_engine(args.database_url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    # Every synthetic user shares one password so load tests can log in.
+    hashed = get_password_hash("benchmark-password")
+    users = copy_rows(engine, "users", USER_COLUMNS, generate_users(args.users, hashed, args.seed), args.batch_size)
+    print(f"Loaded {users} users")
+    accidents = copy_rows(
+        engine, "accidents", ACCIDENT_COLUMNS,
+        generate_accidents(args.accidents, args.users, args.seed, args.days), args.batch_size,
+    )
+    print(f"Loaded {accidents} accidents")
+
+
+if __name__ == "__main__":
+    main()
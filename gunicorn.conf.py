@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+preload_app imports src.api.main once in the master; with MODEL_PRELOAD set
+the models are loaded and warmed there and shared copy-on-write by workers.
+"""
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('API_HOST', '0.0.0.0')}:{os.environ.get('API_PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True